@@ -0,0 +1,102 @@
+import numpy as np
+
+from profiling import span
+
+
+PITCH_LENGTH = 120
+PITCH_WIDTH = 80
+HEATMAP_BINS = (12, 8)
+KDE_BINS = (120, 80)
+KDE_SIGMA = 4
+ZONE_BINS = (6, 3)
+
+# Display modes of draw_pitch besides plain events, and the event types each one applies to.
+SUMMARY_MODES = {
+    'heatmap': ['pass', 'shot', 'recovery', 'assist', 'duel'],
+    'kde': ['pass', 'shot', 'recovery', 'assist', 'duel'],
+    'network': ['pass'],
+    'zones': ['pass', 'assist'],
+}
+
+
+def _grid(x, y, bins):
+    # A pitch.bin_statistic-style dict that pitch.heatmap can draw directly.
+    statistic, x_edges, y_edges = np.histogram2d(
+        x, y, bins=bins, range=[[0, PITCH_LENGTH], [0, PITCH_WIDTH]]
+    )
+    x_grid, y_grid = np.meshgrid(x_edges, y_edges)
+    cx, cy = np.meshgrid((x_edges[:-1] + x_edges[1:]) / 2, (y_edges[:-1] + y_edges[1:]) / 2)
+    return {'statistic': statistic.T, 'x_grid': x_grid, 'y_grid': y_grid, 'cx': cx, 'cy': cy}
+
+
+def heatmap(events, bins=HEATMAP_BINS):
+    return _grid(events.x, events.y, bins)
+
+
+def kde(events, bins=KDE_BINS, sigma=KDE_SIGMA):
+    # Gaussian-smoothed fine histogram: the cost depends on the grid, not on the event count.
+    from scipy.ndimage import gaussian_filter
+
+    grid = _grid(events.x, events.y, bins)
+    density = gaussian_filter(grid['statistic'], sigma=sigma, mode='constant')
+    total = density.sum()
+    grid['statistic'] = density / total if total else density
+    return grid
+
+
+def pass_network(events):
+    # Nodes are players at the average location of their passes; an edge counts how often
+    # one player's pass was followed by a pass from a team-mate, taken as the receiver.
+    teams = {}
+    if not len(events):
+        return teams
+    order = np.lexsort((np.arange(len(events)), events.minute))
+    for team in np.unique(events.team):
+        rows = order[events.team[order] == team]
+        players = events.player[rows]
+        codes, index, passes = np.unique(players, return_inverse=True, return_counts=True)
+        x = np.bincount(index, weights=events.x[rows]) / passes
+        y = np.bincount(index, weights=events.y[rows]) / passes
+
+        passer, receiver = index[:-1], index[1:]
+        links = passer != receiver
+        pairs, pair_counts = np.unique(passer[links] * len(codes) + receiver[links], return_counts=True)
+        teams[events.teams.values[team]] = {
+            'players': [events.players.values[code] for code in codes],
+            'x': x,
+            'y': y,
+            'passes': passes,
+            'from': pairs // len(codes),
+            'to': pairs % len(codes),
+            'count': pair_counts,
+        }
+    return teams
+
+
+def zone_index(x, y, bins=ZONE_BINS):
+    column = np.clip((x / PITCH_LENGTH * bins[0]).astype(int), 0, bins[0] - 1)
+    row = np.clip((y / PITCH_WIDTH * bins[1]).astype(int), 0, bins[1] - 1)
+    return column * bins[1] + row
+
+
+def zone_matrix(events, bins=ZONE_BINS):
+    # matrix[a, b] is the number of events that started in zone a and ended in zone b.
+    zones = bins[0] * bins[1]
+    start = zone_index(events.x, events.y, bins)
+    end = zone_index(events.end_x, events.end_y, bins)
+    matrix = np.bincount(start * zones + end, minlength=zones * zones).reshape(zones, zones)
+    centers = np.arange(zones)
+    return {
+        'matrix': matrix,
+        'center_x': (centers // bins[1] + 0.5) * PITCH_LENGTH / bins[0],
+        'center_y': (centers % bins[1] + 0.5) * PITCH_WIDTH / bins[1],
+        'outgoing': _grid(events.x, events.y, bins),
+    }
+
+
+SUMMARIES = {'heatmap': heatmap, 'kde': kde, 'network': pass_network, 'zones': zone_matrix}
+
+
+def summarize(events, mode):
+    with span('analytics'):
+        return SUMMARIES[mode](events)
@@ -0,0 +1,569 @@
+import functools
+import os
+from collections import deque
+
+import streamlit as st
+
+import profiling
+from analytics import SUMMARY_MODES, summarize
+from events import EventPartitions, EventStore, dicts_to_columns
+from export import FORMATS, SEASON_FORMATS, export_events
+from locales import LOCALES
+from metrics import Metrics
+from registry import EVENT_REGISTRY, FIELD_INPUTS, TEAMS
+from rendering import LRUCache, PitchCanvas, PitchLayers, draw_events, draw_summary, figure_png, legend
+from storage import EventLog
+from vega import entry_spec, events_frame, pitch_spec, with_start
+
+
+# Legends of every event type in every language, built once when the module is imported.
+LEGENDS = {
+    locale: {
+        event_type: legend(event_type, strings['event_types'][event_type]['title'], strings['teams'],
+                           strings['subtypes'][event_type])
+        for event_type in EVENT_REGISTRY
+    }
+    for locale, strings in LOCALES.items()
+}
+
+# Vega-Lite specs of the interactive pitch, per language and event type, without their data.
+CHART_SPECS = {
+    locale: {
+        event_type: pitch_spec(event_type, strings['event_types'][event_type]['title'], strings['teams'],
+                               strings['subtypes'][event_type])
+        for event_type in EVENT_REGISTRY
+    }
+    for locale, strings in LOCALES.items()
+}
+
+# The same pitch for placing events by clicking on it.
+ENTRY_SPECS = {
+    locale: {
+        event_type: entry_spec(event_type, strings['event_types'][event_type]['title'], strings['teams'],
+                               strings['subtypes'][event_type])
+        for event_type in EVENT_REGISTRY
+    }
+    for locale, strings in LOCALES.items()
+}
+
+ENTRY_MODES = ['form', 'pitch']
+COORDINATES = ('x', 'y', 'end_x', 'end_y')
+
+# The metric tables of the summary tab and the export, and the string each is titled with.
+METRIC_TABLES = {'team': 'teams_label', 'player': 'players'}
+
+PROFILE_HISTORY = 500
+
+# How often a page checks the shared log for what other sessions tagged; 0 turns polling off.
+SYNC_SECONDS = float(os.environ.get('APPPLOT_SYNC_SECONDS', '2')) or None
+
+VIEW_MODES = {
+    event_type: ['events'] + [mode for mode, event_types in SUMMARY_MODES.items() if event_type in event_types]
+    for event_type in EVENT_REGISTRY
+}
+
+
+def draw_pitch(events, event_type, locale, mode='events', summary=None, renderer='static'):
+    # The static renderer returns a matplotlib figure; the interactive one returns the table
+    # of events that st.vega_lite_chart draws in the browser with CHART_SPECS.
+    strings = LOCALES[locale]
+    if renderer == 'interactive':
+        return events_frame(events, strings['teams'], strings['subtypes'][event_type])
+    if mode == 'events':
+        return draw_events(events, LEGENDS[locale][event_type])
+    if summary is None:
+        summary = summarize(events, mode)
+    if mode == 'network':
+        summary = {strings['teams'].get(team, team): network for team, network in summary.items()}
+    return draw_summary(summary, mode, f"{LEGENDS[locale][event_type][0]} - {strings['views'][mode]}")
+
+
+@st.cache_resource
+def event_log():
+    return EventLog()
+
+
+@st.cache_resource
+def pitch_canvas(locale, event_type):
+    return PitchCanvas(event_type, LEGENDS[locale][event_type])
+
+
+def event_filters(players, teams, minutes, subtypes=None):
+    # Only the filters that restrict something, as tuples so they can be part of a cache key.
+    filters = {}
+    if players:
+        filters['players'] = tuple(players)
+    if teams:
+        filters['teams'] = tuple(teams)
+    if tuple(minutes) != (0, 120):
+        filters['minutes'] = tuple(minutes)
+    if subtypes:
+        filters['subtypes'] = tuple(subtypes)
+    return filters
+
+
+def pitch_summary(game_name, event_type, mode, filters):
+    table = st.session_state.events[game_name][event_type]
+    key = (game_name, event_type, mode, tuple(sorted(filters.items())), table.version)
+    summary = st.session_state.summary_cache.get(key)
+    if summary is None:
+        summary = summarize(table.select(**filters), mode)
+        st.session_state.summary_cache.put(key, summary)
+    return summary
+
+
+def pitch_image(game_name, event_type, locale, mode='events', filters=None):
+    filters = filters or {}
+    table = st.session_state.events[game_name][event_type]
+    key = (game_name, event_type, mode, tuple(sorted(filters.items())), table.version)
+    png = st.session_state.render_cache.get(key)
+    if png is None:
+        if mode != 'events':
+            summary = pitch_summary(game_name, event_type, mode, filters)
+            png = figure_png(draw_pitch(None, event_type, locale, mode, summary))
+        elif filters:
+            png = pitch_canvas(locale, event_type).render(table.select(**filters))
+        else:
+            png = st.session_state.pitch_layers.render((game_name, event_type), pitch_canvas(locale, event_type), table)
+        st.session_state.render_cache.put(key, png)
+    return png
+
+
+def pitch_chart(game_name, event_type, locale, filters):
+    table = st.session_state.events[game_name][event_type]
+    key = (game_name, event_type, 'interactive', tuple(sorted(filters.items())), table.version)
+    frame = st.session_state.render_cache.get(key)
+    if frame is None:
+        with profiling.span('serialize'):
+            frame = draw_pitch(table.select(**filters), event_type, locale, renderer='interactive')
+        st.session_state.render_cache.put(key, frame)
+    return frame
+
+
+def static_png(table, event_type, locale, filters):
+    # For the download button: runs on Streamlit's download thread, so it only uses what it is given.
+    return lambda: figure_png(draw_pitch(table.select(**filters), event_type, locale))
+
+
+def init_session():
+    if 'events' not in st.session_state:
+        st.session_state.events = EventPartitions(event_log().load)
+    if 'selected_game' not in st.session_state:
+        st.session_state.selected_game = None
+    if 'render_cache' not in st.session_state:
+        st.session_state.render_cache = LRUCache()
+    if 'summary_cache' not in st.session_state:
+        st.session_state.summary_cache = LRUCache(max_size=64)
+    if 'pitch_layers' not in st.session_state:
+        st.session_state.pitch_layers = PitchLayers()
+    if 'pending' not in st.session_state:
+        st.session_state.pending = {}
+    if 'metrics' not in st.session_state:
+        st.session_state.metrics = {}
+
+
+def import_events(game_name, file):
+    # importer (like season below) needs pandas, so it is only imported once it is used.
+    from importer import file_errors, frame_columns, read_events, validate
+
+    try:
+        frame = read_events(file, file.name)
+    except ValueError as error:
+        st.error(str(error))
+        return 0, file_errors(str(error))
+    valid, errors = validate(frame)
+    if len(valid):
+        event_log().append_many(game_name, frame_columns(valid))
+        sync_game(game_name)
+    return len(valid), errors
+
+
+def sync_game(game_name):
+    # This session never adds its own events to its store directly: they come back from the
+    # log with everyone else's, once each and in the order the log took them.
+    return event_log().sync(game_name, st.session_state.events[game_name])
+
+
+@st.fragment(run_every=SYNC_SECONDS)
+def live_sync(game_name):
+    # Polls the shared log; when other sessions added or removed games or events, the whole page reruns.
+    games = event_log().games()
+    changed = games != st.session_state.games
+    for open_game in st.session_state.events:
+        if open_game not in games:
+            forget_game(open_game)
+    if game_name in games and sync_game(game_name):
+        changed = True
+    if changed:
+        st.rerun()
+
+
+def forget_game(game_name):
+    # Drops what this session holds of a game: its events, cached images and metrics.
+    st.session_state.events.drop(game_name)
+    st.session_state.render_cache.drop(game_name)
+    st.session_state.summary_cache.drop(game_name)
+    st.session_state.pitch_layers.drop(game_name)
+    st.session_state.metrics.pop(game_name, None)
+
+
+def remove_game(game_name, strings):
+    if game_name in st.session_state.games:
+        st.session_state.games.remove(game_name)
+        event_log().remove_game(game_name)
+        if st.session_state.selected_game == game_name:
+            st.session_state.selected_game = None
+        forget_game(game_name)
+        st.success(strings['game_removed'].format(game=game_name))
+    else:
+        st.error(strings['game_not_found'])
+
+
+def event_fields(event_type, strings, fields):
+    # The widgets of an event, with the given fields from the registry; every widget key starts with the event type.
+    spec = EVENT_REGISTRY[event_type]
+    labels = strings['event_types'][event_type]
+    arrows = 'end_x' in spec['fields']
+
+    event = {'type': event_type}
+    event['player'] = st.text_input(strings['player'], key=f"{event_type}_player_name")
+    event['minute'] = st.number_input(strings['minute'], min_value=0, max_value=120, step=1, key=f"{event_type}_minute")
+    for field in fields:
+        low, high, step = FIELD_INPUTS[field]
+        label = strings['fields'][f'start_{field}' if arrows and field in ('x', 'y') else field]
+        event[field] = st.number_input(label, min_value=low, max_value=high, step=step, key=f"{event_type}_{field}")
+    event[spec['subtype_field']] = st.selectbox(labels['subtype'], spec['subtypes'], format_func=strings['subtypes'][event_type].get,
+                                                key=f"{event_type}_subtype")
+    event['team'] = st.selectbox(strings['team'], TEAMS, format_func=strings['teams'].get, key=f"{event_type}_team")
+    return event
+
+
+def pending_entry(game_name, event_type):
+    # Events placed on the pitch but not saved yet, and the start of an arrow whose end is still to be clicked.
+    return st.session_state.pending.setdefault((game_name, event_type), {'events': [], 'start': None, 'clicks': 0})
+
+
+def place_click(game_name, event_type, chart_key):
+    # Runs before the fragment reruns, so the chart it draws already shows the click.
+    entry = pending_entry(game_name, event_type)
+    points = st.session_state[chart_key].selection.click
+    # The next chart gets a new key, so clicking the same point again is a new selection.
+    entry['clicks'] += 1
+    if not points:
+        return
+    point = (float(points[0]['x']), float(points[0]['y']))
+    if 'end_x' in EVENT_REGISTRY[event_type]['fields']:
+        if entry['start'] is None:
+            entry['start'] = point
+            return
+        (x, y), (end_x, end_y) = entry['start'], point
+        entry['start'] = None
+        entry['events'].append(dict(entry['details'], x=x, y=y, end_x=end_x, end_y=end_y))
+    else:
+        entry['events'].append(dict(entry['details'], x=point[0], y=point[1]))
+
+
+def undo_click(game_name, event_type):
+    entry = pending_entry(game_name, event_type)
+    if entry['start'] is not None:
+        entry['start'] = None
+    elif entry['events']:
+        entry['events'].pop()
+
+
+def save_pending(game_name, event_type):
+    # One transaction and one store extend for the whole batch.
+    entry = pending_entry(game_name, event_type)
+    event_log().append_many(game_name, dicts_to_columns(entry['events']))
+    sync_game(game_name)
+    entry['saved'] = len(entry['events'])
+    entry['events'] = []
+
+
+@st.fragment
+def entry_panel(game_name, event_type, strings, locale, visible):
+    # Clicks on the pitch and changes to the fields only rerun this fragment; the page is
+    # only rerun when the placed events are saved, all at once.
+    spec = EVENT_REGISTRY[event_type]
+    entry = pending_entry(game_name, event_type)
+    saved = entry.pop('saved', 0)
+    if saved:
+        st.success(strings['entry_saved'].format(count=saved))
+    entry['details'] = event_fields(event_type, strings, [field for field in spec['fields'] if field not in COORDINATES])
+    st.caption(strings['entry_arrows' if 'end_x' in spec['fields'] else 'entry_points'])
+    if visible:
+        pending = EventStore()
+        pending.extend(dicts_to_columns(entry['events']))
+        chart_key = f"{event_type}_entry_{entry['clicks']}"
+        st.vega_lite_chart(draw_pitch(pending[event_type].view(), event_type, locale, renderer='interactive'),
+                           with_start(ENTRY_SPECS[locale][event_type], entry['start']), key=chart_key,
+                           on_select=functools.partial(place_click, game_name, event_type, chart_key))
+
+    undo_column, save_column = st.columns(2)
+    undo_column.button(strings['entry_undo'], on_click=undo_click, args=(game_name, event_type),
+                       disabled=not entry['events'] and entry['start'] is None, key=f"{event_type}_entry_undo")
+    if save_column.button(strings['entry_save'].format(count=len(entry['events'])), disabled=not entry['events'],
+                          type='primary', key=f"{event_type}_entry_save"):
+        save_pending(game_name, event_type)
+        st.rerun()
+
+
+def event_form(game_name, event_type, strings, locale, tab):
+    spec = EVENT_REGISTRY[event_type]
+    labels = strings['event_types'][event_type]
+
+    st.header(labels['add'])
+    entry_mode = st.radio(strings['entry_mode'], ENTRY_MODES, format_func=strings['entry_modes'].get, horizontal=True,
+                          key=f"{event_type}_entry_mode")
+    if entry_mode == 'pitch':
+        entry_panel(game_name, event_type, strings, locale, tab.open)
+        return
+
+    event = event_fields(event_type, strings, spec['fields'])
+    if st.button(labels['add']):
+        event_log().append(game_name, event)
+        sync_game(game_name)
+        st.success(labels['added'])
+
+
+def event_view(game_name, event_type, strings, locale, tab, panel_filters, interactive):
+    # Returns the filters of this tab, which the export reuses.
+    st.subheader(strings['event_types'][event_type]['view'])
+    mode = st.radio(strings['view'], VIEW_MODES[event_type], format_func=strings['views'].get, horizontal=True,
+                    key=f"{event_type}_view")
+    subtypes = st.multiselect(strings['show_only'], EVENT_REGISTRY[event_type]['subtypes'],
+                              format_func=strings['subtypes'][event_type].get, key=f"{event_type}_subtypes")
+    filters = event_filters(*panel_filters, subtypes)
+    if tab.open:
+        if interactive and mode == 'events':
+            st.vega_lite_chart(pitch_chart(game_name, event_type, locale, filters), CHART_SPECS[locale][event_type])
+            st.download_button(strings['download_png'], static_png(st.session_state.events[game_name][event_type], event_type, locale, filters),
+                               file_name=f'{event_type}.png', mime='image/png', on_click='ignore', key=f"{event_type}_png")
+        else:
+            st.image(pitch_image(game_name, event_type, locale, mode, filters), width='stretch')
+    return filters
+
+
+def filtered_metrics(store, filters):
+    # Totals of just the events the filters select, built from scratch.
+    metrics = Metrics()
+    for event_type, table in store.items():
+        metrics.add(table.select(**filters[event_type]))
+    return metrics
+
+
+def game_metrics(game_name, filters):
+    # The session's running totals of the game, only updated with new events; when some tab
+    # filters its events, totals of just those.
+    store = st.session_state.events[game_name]
+    if any(filters.values()):
+        return filtered_metrics(store, filters)
+    return st.session_state.metrics.setdefault(game_name, Metrics()).update(store)
+
+
+def summary_headers(strings):
+    # Titles of the metric columns, and of the pass counts by pass type the season summaries add.
+    headers = dict(strings['metrics'], player=strings['player'], team=strings['team'])
+    headers.update({f'passes - {key}': f"{strings['metrics']['passes']} - {label}"
+                    for key, label in strings['subtypes']['pass'].items()})
+    return headers
+
+
+def metric_tables(store, metrics, strings):
+    # {title: columns} per team and per player, with translated headers and team names.
+    headers = summary_headers(strings)
+    tables = {}
+    for by, title in METRIC_TABLES.items():
+        columns = metrics.table(store, by)
+        columns['team'] = [strings['teams'].get(team, team) for team in columns['team']]
+        tables[strings[title]] = {headers[column]: values for column, values in columns.items()}
+    return tables
+
+
+def table_rows(columns):
+    # Missing values (a rate without duels) become None so the workbook leaves the cell empty.
+    return ([None if isinstance(value, float) and value != value else value for value in row]
+            for row in zip(*(list(values) for values in columns.values())))
+
+
+def metrics_view(game_name, strings, tab, filters):
+    if tab.open:
+        store = st.session_state.events[game_name]
+        for title, columns in metric_tables(store, game_metrics(game_name, filters), strings).items():
+            st.subheader(title)
+            st.dataframe(columns, hide_index=True)
+
+
+def deferred_file(write):
+    # For download buttons: write runs only once the button is clicked, on Streamlit's download
+    # thread, so nothing is exported or held before then. It returns the path of a temporary
+    # file, which is removed as soon as its bytes are read.
+    def data():
+        path = write()
+        try:
+            with open(path, 'rb') as file:
+                return file.read()
+        finally:
+            os.remove(path)
+    return data
+
+
+def export_file(store, game_name, fmt, filters, strings):
+    # Runs once the download is clicked: the workbook's metric sheets are only built then,
+    # from the same filtered events as its event sheet.
+    summaries = []
+    if fmt == 'xlsx':
+        summaries = [(title, list(columns), list(table_rows(columns)))
+                     for title, columns in metric_tables(store, filtered_metrics(store, filters), strings).items()]
+    return export_events(store, game_name, fmt, filters=filters, sheet_name=strings['sheet_name'], summaries=summaries)
+
+
+def season_file(db_path, games, fmt, strings):
+    # season needs pandas, so it is only imported once a season is exported.
+    from season import export_season
+
+    return export_season(db_path, games, fmt, headers=summary_headers(strings), team_names=strings['teams'])
+
+
+def profile_next_rerun():
+    st.session_state.profile_next_rerun = True
+
+
+def profiling_panel(record, strings):
+    # Drawn after the rerun it reports on, so its own cost is not part of the numbers.
+    history = st.session_state.setdefault('profile_history', deque(maxlen=PROFILE_HISTORY))
+    history.append(record)
+
+    st.sidebar.header(strings['profile_header'])
+    st.sidebar.caption(strings['profile_last'])
+    breakdown = record.breakdown()
+    st.sidebar.dataframe({
+        'span': list(breakdown),
+        'ms': [round(seconds * 1000, 1) for seconds in breakdown.values()],
+        'calls': [record.calls.get(name, 1) for name in breakdown],
+    }, hide_index=True)
+    if record.counts:
+        st.sidebar.dataframe({'counter': list(record.counts), 'value': list(record.counts.values())}, hide_index=True)
+
+    st.sidebar.caption(strings['profile_session'].format(count=len(history)))
+    stats = profiling.percentiles(history)
+    st.sidebar.dataframe({
+        'span': list(stats),
+        'p50 ms': [round(p50, 1) for p50, _ in stats.values()],
+        'p95 ms': [round(p95, 1) for _, p95 in stats.values()],
+    }, hide_index=True)
+
+    st.sidebar.button(strings['profile_next'], on_click=profile_next_rerun)
+    if record.profile_path:
+        with open(record.profile_path, 'rb') as file:
+            stats_file = file.read()
+        os.remove(record.profile_path)
+        st.sidebar.download_button(strings['profile_download'], stats_file, file_name='rerun.prof')
+        st.sidebar.code(record.profile_text)
+
+
+def main(locale):
+    # With APPPLOT_PROFILE set, every rerun is recorded and the debug panel is added to the sidebar.
+    if not profiling.ENABLED:
+        page(locale)
+        return
+    with profiling.rerun(profile=st.session_state.pop('profile_next_rerun', False)) as record:
+        page(locale)
+    profiling_panel(record, LOCALES[locale])
+
+
+def page(locale):
+    strings = LOCALES[locale]
+    init_session()
+
+    st.set_page_config(
+        page_title=strings['page_title'],
+        page_icon="icons8-soccer-ball-50.png"
+    )
+
+    st.title(strings['page_title'])
+    st.session_state.games = event_log().games()
+
+
+    st.sidebar.header(strings['add_game_header'])
+    game_name = st.text_input(strings['game_name'])
+    if st.button(strings['add_game']):
+        if game_name:
+            event_log().add_game(game_name)
+            if game_name not in st.session_state.games:
+                st.session_state.games.append(game_name)
+            st.success(strings['game_added'].format(game=game_name))
+
+
+    st.sidebar.header(strings['remove_game_header'])
+    if st.session_state.games:
+        game_to_remove = st.selectbox(strings['remove_game_select'], st.session_state.games)
+        if st.button(strings['remove_game']):
+            if game_to_remove:
+                remove_game(game_to_remove, strings)
+    else:
+        st.write(strings['no_games'])
+
+
+    st.sidebar.header(strings['select_game_header'])
+    selected_game = st.selectbox(strings['select_game'], st.session_state.games)
+    st.session_state.selected_game = selected_game
+    if selected_game:
+        sync_game(selected_game)
+    live_sync(selected_game)
+
+    if selected_game:
+        st.title(strings['game_title'].format(game=selected_game))
+
+        st.header(strings['import_header'])
+        import_file = st.file_uploader(strings['import_file'], type=["csv", "xlsx", "json"], key="import_file")
+        if import_file is not None and st.button(strings['import_button']):
+            imported, errors = import_events(selected_game, import_file)
+            st.success(strings['imported'].format(count=imported))
+            if len(errors):
+                st.warning(strings['skipped'].format(count=len(errors)))
+                st.dataframe(errors.head(100), hide_index=True)
+
+        st.header(strings['filter_header'])
+        filter_players = st.multiselect(strings['players'], sorted(st.session_state.events[selected_game].players.values),
+                                        key="filter_players")
+        filter_teams = st.multiselect(strings['teams_label'], TEAMS, format_func=strings['teams'].get, key="filter_teams")
+        filter_minutes = st.slider(strings['minutes'], min_value=0, max_value=120, value=(0, 120), key="filter_minutes")
+        panel_filters = (filter_players, filter_teams, filter_minutes)
+        interactive = st.toggle(strings['interactive'], value=True, key="interactive_pitch")
+
+        *tabs, metrics_tab = st.tabs([strings['event_types'][event_type]['tab'] for event_type in EVENT_REGISTRY]
+                                     + [strings['metrics_tab']], key='event_tab', on_change='rerun')
+        export_filters = {}
+        for event_type, tab in zip(EVENT_REGISTRY, tabs):
+            with tab:
+                event_form(selected_game, event_type, strings, locale, tab)
+                export_filters[event_type] = event_view(selected_game, event_type, strings, locale, tab, panel_filters,
+                                                        interactive)
+        with metrics_tab:
+            metrics_view(selected_game, strings, metrics_tab,
+                         {event_type: event_filters(*panel_filters) for event_type in EVENT_REGISTRY})
+
+
+        st.header(strings['export_header'])
+        export_format = st.selectbox(strings['export_format'], list(FORMATS), format_func=FORMATS.get, key="export_format")
+        st.download_button(strings['export_download'],
+                           deferred_file(functools.partial(export_file, st.session_state.events[selected_game],
+                                                           selected_game, export_format, export_filters, strings)),
+                           file_name=f"{strings['export_file'].format(game=selected_game)}.{export_format}",
+                           on_click='ignore', key="export_download")
+
+
+    if st.session_state.games:
+        st.header(strings['season_header'])
+        season_format = st.selectbox(strings['season_format'], list(SEASON_FORMATS), format_func=SEASON_FORMATS.get,
+                                     key="season_format")
+        st.download_button(strings['season_download'],
+                           deferred_file(functools.partial(season_file, event_log().path, list(st.session_state.games),
+                                                           season_format, strings)),
+                           file_name=f"{strings['season_file']}.{'xlsx' if season_format == 'xlsx' else 'zip'}",
+                           on_click='ignore', key="season_download")
+
+
+if __name__ == '__main__':
+    main(os.environ.get('APPPLOT_LOCALE', 'pt'))
@@ -0,0 +1,50 @@
+import io
+import os
+import sys
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from events import EventStore
+from locales import LOCALES
+from rendering import draw_events, legend
+from synthetic import event_columns
+
+
+PASS_LEGEND = legend('pass', 'Passes', LOCALES['en']['teams'], LOCALES['en']['subtypes']['pass'])
+SIZES = [10, 100, 1000, 10000]
+
+
+def synthetic_passes(n, seed=0):
+    store = EventStore()
+    store.extend(event_columns('pass', n, seed))
+    return store['pass'].view()
+
+
+def time_render(events, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fig = draw_events(events, PASS_LEGEND)
+        fig.savefig(io.BytesIO(), format='png')
+        plt.close(fig)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    previous = None
+    print(f"{'events':>8} {'seconds':>10} {'growth':>8}")
+    for n in SIZES:
+        seconds = time_render(synthetic_passes(n))
+        growth = '' if previous is None else f'{seconds / previous:.2f}x'
+        print(f'{n:>8} {seconds:>10.3f} {growth:>8}')
+        previous = seconds
+
+
+if __name__ == '__main__':
+    main()
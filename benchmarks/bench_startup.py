@@ -0,0 +1,80 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from storage import EventLog
+
+
+# Each measurement runs in a fresh interpreter, so nothing is already imported or cached.
+IMPORT_TIME = """
+import time
+start = time.perf_counter()
+import app
+print(time.perf_counter() - start)
+"""
+
+FIRST_RENDER = """
+import sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file(sys.argv[1], default_timeout=300)
+app.run()
+if app.exception:
+    sys.exit(app.exception[0].value)
+print(time.perf_counter() - start)
+"""
+
+
+def seed_log(path, events):
+    # One game of passes, so the first run of the app opens it and draws its pitch.
+    rng = np.random.default_rng(0)
+    log = EventLog(path)
+    log.add_game('benchmark')
+    log.append_many('benchmark', {
+        'type': np.full(events, 'pass', dtype=object),
+        'player': np.array([f'player {number}' for number in rng.integers(1, 23, events)], dtype=object),
+        'minute': rng.integers(0, 91, events),
+        'x': rng.uniform(0, 120, events),
+        'y': rng.uniform(0, 80, events),
+        'end_x': rng.uniform(0, 120, events),
+        'end_y': rng.uniform(0, 80, events),
+        'team': rng.choice(['home', 'away'], events).astype(object),
+        'subtype': np.full(events, 'pass', dtype=object),
+        'xg': np.full(events, np.nan),
+    })
+    log.close()
+
+
+def measure(code, args=(), env=None):
+    output = subprocess.run([sys.executable, '-c', code, *args], cwd=ROOT, env=env, check=True,
+                            capture_output=True, text=True).stdout
+    return float(output.split()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time a cold import of the app and its first full render.')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--events', type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(os.environ, APPPLOT_DB=os.path.join(directory, 'startup.db'))
+        seed_log(env['APPPLOT_DB'], args.events)
+        imports = [measure(IMPORT_TIME, env=env) for _ in range(args.repeat)]
+        renders = [measure(FIRST_RENDER, [os.path.join(ROOT, 'enappplot.py')], env=env) for _ in range(args.repeat)]
+
+    print(f"{'measure':>14} {'median':>8} {'min':>8}")
+    print(f"{'import app':>14} {statistics.median(imports):>8.3f} {min(imports):>8.3f}")
+    print(f"{'first render':>14} {statistics.median(renders):>8.3f} {min(renders):>8.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import matplotlib
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app import draw_pitch
+from events import EventStore
+from export import FORMATS, export_events
+from locales import LOCALES
+from metrics import Metrics
+from registry import EVENT_TYPES
+from rendering import LRUCache, PitchCanvas, PitchLayers, figure_png, legend
+from synthetic import event_columns, match_columns, season_columns
+
+DRAW_SIZES = [10, 100, 1000, 10000]
+
+
+def store_of(columns):
+    store = EventStore()
+    store.extend(columns)
+    return store
+
+
+def best_of(function, repeat):
+    # One untimed call first, so lazy imports and font caches are not counted.
+    function()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times), statistics.median(times)
+
+
+def bench_draw(repeat):
+    # draw_pitch plus the PNG encoding, per event type and size.
+    results = []
+    for event_type in EVENT_TYPES:
+        for size in DRAW_SIZES:
+            events = store_of(event_columns(event_type, size))[event_type].view()
+            best, median = best_of(lambda: figure_png(draw_pitch(events, event_type, 'en')), repeat)
+            results.append({'name': 'draw_pitch', 'event_type': event_type, 'events': size,
+                            'best_seconds': best, 'median_seconds': median})
+            print(f'draw_pitch {event_type:>8} {size:>6} {median:>8.3f}s')
+    return results
+
+
+def bench_export(games, repeat):
+    # Throughput and peak traced memory of one game's export, for a game scaled to a season.
+    results = []
+    columns = season_columns(games)
+    store = EventStore()
+    for game_columns in columns.values():
+        store.extend(game_columns)
+    events = sum(len(table) for _, table in store.items())
+    for fmt in FORMATS:
+        paths = []
+        best, median = best_of(lambda: paths.append(export_events(store, 'season', fmt)), repeat)
+        size = os.path.getsize(paths[-1])
+        for path in paths:
+            os.remove(path)
+
+        tracemalloc.start()
+        os.remove(export_events(store, 'season', fmt))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results.append({'name': 'export', 'format': fmt, 'events': events, 'best_seconds': best,
+                        'median_seconds': median, 'events_per_second': events / median,
+                        'peak_mb': peak / 2 ** 20, 'file_mb': size / 2 ** 20})
+        print(f'export {fmt:>8} {events:>7} events {events / median:>10.0f} events/s {peak / 2 ** 20:>7.1f} MB peak')
+    return results
+
+
+def bench_metrics(games, repeat):
+    # Metrics of a game scaled to a season, from scratch and then for one more match appended.
+    store = store_of(match_columns(scale=games))
+    events = sum(len(table) for _, table in store.items())
+    _, full = best_of(lambda: Metrics().update(store), repeat)
+
+    metrics = Metrics().update(store)
+    updates = []
+    for seed in range(1, repeat + 1):
+        store.extend(match_columns(seed=seed))
+        start = time.perf_counter()
+        metrics.update(store)
+        updates.append(time.perf_counter() - start)
+    delta = statistics.median(updates)
+    print(f'metrics {events:>7} events {full * 1000:>8.2f} ms from scratch, {delta * 1000:>8.2f} ms per appended match')
+    return [{'name': 'metrics', 'events': events, 'median_seconds': full, 'append_seconds': delta}]
+
+
+def traced(function):
+    tracemalloc.start()
+    result = function()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current / 2 ** 20
+
+
+def bench_session_memory():
+    # What one game costs in a session: the store, its filter indexes, the rendered layers
+    # and the cached PNGs. The canvases are shared by every game and not counted.
+    columns = season_columns(1)['match 001']
+    canvases = {event_type: PitchCanvas(event_type, legend(event_type, event_type, LOCALES['en']['teams'],
+                                                           LOCALES['en']['subtypes'][event_type]))
+                for event_type in EVENT_TYPES}
+    store, store_mb = traced(lambda: store_of(columns))
+    _, index_mb = traced(lambda: [table.index() for _, table in store.items()])
+    layers = PitchLayers()
+    cache = LRUCache()
+    _, render_mb = traced(lambda: [
+        cache.put(('match', event_type), layers.render(('match', event_type), canvases[event_type], store[event_type]))
+        for event_type in EVENT_TYPES
+    ])
+    events = sum(len(table) for _, table in store.items())
+    result = {'name': 'session_memory', 'events': events, 'store_mb': store_mb, 'index_mb': index_mb,
+              'render_mb': render_mb, 'total_mb': store_mb + index_mb + render_mb}
+    print(f'session memory per game: {events} events, store {store_mb:.2f} MB, indexes {index_mb:.2f} MB, '
+          f'rendered {render_mb:.2f} MB')
+    return [result]
+
+
+def metadata():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                                text=True).stdout.strip()
+    except OSError:
+        commit = ''
+    return {
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np.__version__,
+        'matplotlib': matplotlib.__version__,
+    }
+
+
+def result_key(result):
+    return tuple((name, value) for name, value in result.items() if isinstance(value, str) or name == 'events')
+
+
+def compare(results, previous_path):
+    # Prints how every timing and memory figure moved against an earlier run.
+    with open(previous_path) as file:
+        previous = {result_key(result): result for result in json.load(file)['results']}
+    print(f'\ncompared with {previous_path}')
+    for result in results:
+        old = previous.get(result_key(result))
+        if old is None:
+            continue
+        label = ' '.join(str(value) for _, value in result_key(result))
+        for name in ('median_seconds', 'peak_mb', 'total_mb'):
+            if name in result and old.get(name):
+                print(f'{label:>30} {name:>15} {result[name] / old[name]:>6.2f}x')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark drawing, exporting and session memory on synthetic matches.')
+    parser.add_argument('--output', default=os.path.join(ROOT, 'benchmarks', 'results.json'))
+    parser.add_argument('--compare', help='JSON file of an earlier run to compare with')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--games', type=int, default=10, help='matches exported together')
+    parser.add_argument('--skip', nargs='*', default=[], choices=['draw', 'export', 'metrics', 'memory'])
+    args = parser.parse_args()
+
+    results = []
+    if 'draw' not in args.skip:
+        results += bench_draw(args.repeat)
+    if 'export' not in args.skip:
+        results += bench_export(args.games, args.repeat)
+    if 'metrics' not in args.skip:
+        results += bench_metrics(args.games, args.repeat)
+    if 'memory' not in args.skip:
+        results += bench_session_memory()
+
+    with open(args.output, 'w') as file:
+        json.dump({'metadata': metadata(), 'results': results}, file, indent=2)
+    print(f'results written to {args.output}')
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
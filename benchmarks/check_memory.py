@@ -0,0 +1,66 @@
+import argparse
+import os
+import sys
+import tempfile
+
+import matplotlib.pyplot as plt
+from streamlit.testing.v1 import AppTest
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TABS = ['Passes', 'Shots', 'Recoveries', 'Assists', 'Aerial Duels']
+
+
+def rss_mb():
+    with open('/proc/self/statm') as statm:
+        pages = int(statm.read().split()[1])
+    return pages * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the app for many reruns and check that figures and RSS stay flat.')
+    parser.add_argument('--reruns', type=int, default=200)
+    parser.add_argument('--max-growth-mb', type=float, default=40.0)
+    args = parser.parse_args()
+
+    # The app runs in this process and reads both variables on import: the events it adds go to
+    # a throwaway log rather than the user's appplot.db, and no polling fragment is started.
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ['APPPLOT_DB'] = os.path.join(directory, 'memory.db')
+        os.environ['APPPLOT_SYNC_SECONDS'] = '0'
+        check(args)
+
+
+def check(args):
+    app = AppTest.from_file(os.path.join(ROOT, 'enappplot.py'), default_timeout=120)
+    # The client-side pitch draws no matplotlib figures, so it would hide a figure leak.
+    app.session_state.interactive_pitch = False
+    app.run()
+    app.text_input[0].set_value('memory check').run()
+    app.button[0].click().run()
+
+    warmup = args.reruns // 4
+    baseline = None
+    for rerun in range(args.reruns):
+        app.session_state.event_tab = TABS[rerun % len(TABS)]
+        if rerun % 2:
+            [button for button in app.button if button.label == 'Add Pass'][0].click()
+        app.run()
+        if app.exception:
+            sys.exit(f'rerun {rerun} raised: {app.exception[0].value}')
+        if rerun == warmup:
+            baseline = rss_mb()
+        if rerun % 25 == 0:
+            print(f'rerun {rerun:>4}: {len(plt.get_fignums())} open figures, {rss_mb():.1f} MB RSS')
+
+    figures = len(plt.get_fignums())
+    growth = rss_mb() - baseline
+    print(f'after {args.reruns} reruns: {figures} open figures, RSS grew {growth:.1f} MB since rerun {warmup}')
+    if figures:
+        sys.exit('matplotlib figures are leaking across reruns')
+    if growth > args.max_growth_mb:
+        sys.exit(f'RSS grew by more than {args.max_growth_mb} MB')
+
+
+if __name__ == '__main__':
+    main()
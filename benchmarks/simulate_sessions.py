@@ -0,0 +1,141 @@
+import argparse
+import hashlib
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from events import EventStore
+from storage import EventLog
+from synthetic import match_columns
+
+GAME = 'simulated match'
+
+
+def session_columns(columns, sessions, split):
+    # What each analyst tags: the values of split (a team or an event type) dealt out in turn.
+    values = list(dict.fromkeys(columns[split]))
+    shares = []
+    for session in range(sessions):
+        rows = np.isin(columns[split], values[session::sessions])
+        shares.append({name: column[rows] for name, column in columns.items()})
+    return shares
+
+
+def digest(store):
+    # Equal for two stores holding the same events in the same order.
+    hasher = hashlib.sha256()
+    for event_type, table in store.items():
+        events = table.view()
+        hasher.update(event_type.encode())
+        for name in ('x', 'y', 'end_x', 'end_y', 'xg', 'minute'):
+            hasher.update(np.ascontiguousarray(getattr(events, name), dtype=np.float64).tobytes())
+        for codes, interner in ((events.player, events.players), (events.team, events.teams),
+                                (events.subtype, events.subtypes)):
+            hasher.update('\0'.join(map(str, interner.decode(codes))).encode())
+    return hasher.hexdigest()
+
+
+def tag(log, columns, batch, pause, seed, barrier):
+    # One analyst: appends their events a batch at a time and pulls everyone's after each
+    # append, like the app does; once every analyst is done, pulls the rest.
+    rng = np.random.default_rng(seed)
+    store = EventStore()
+    polls = pulled = 0
+    for start in range(0, len(columns['type']), batch):
+        log.append_many(GAME, {name: column[start:start + batch] for name, column in columns.items()})
+        pulled += log.sync(GAME, store)
+        polls += 1
+        time.sleep(rng.uniform(0, pause))
+    barrier.wait()
+    pulled += log.sync(GAME, store)
+    return {'digest': digest(store), 'events': sum(len(table) for _, table in store.items()), 'seq': store.seq,
+            'polls': polls + 1, 'pulled': pulled}
+
+
+def run_process(path, columns, batch, pause, seed, barrier, results):
+    # A session of another Streamlit process: its own connection to the same file.
+    log = EventLog(path)
+    results.put(tag(log, columns, batch, pause, seed, barrier))
+    log.close()
+
+
+def simulate(path, shares, mode, batch, pause):
+    if mode == 'threads':
+        # Sessions of one server share the st.cache_resource log.
+        log = EventLog(path)
+        barrier = threading.Barrier(len(shares))
+        results = []
+        threads = [threading.Thread(target=lambda share, seed: results.append(tag(log, share, batch, pause, seed, barrier)),
+                                    args=(share, seed)) for seed, share in enumerate(shares)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        log.close()
+        return results
+    context = multiprocessing.get_context('spawn')
+    barrier = context.Barrier(len(shares))
+    queue = context.Queue()
+    processes = [context.Process(target=run_process, args=(path, share, batch, pause, seed, barrier, queue))
+                 for seed, share in enumerate(shares)]
+    for process in processes:
+        process.start()
+    results = [queue.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tag one game from several simulated sessions at once and check '
+                                                 'that every session ends up with the same events as the log.')
+    parser.add_argument('--sessions', type=int, default=4)
+    parser.add_argument('--mode', choices=['threads', 'processes'], default='threads')
+    parser.add_argument('--split', choices=['team', 'type'], default='type', help='what each analyst tags')
+    parser.add_argument('--batch', type=int, default=5, help='events per append')
+    parser.add_argument('--pause', type=float, default=0.002, help='longest pause between appends, in seconds')
+    parser.add_argument('--scale', type=float, default=1.0, help='multiplies the events of the match')
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix='appplot-sessions-')
+    path = os.path.join(directory, 'sessions.db')
+    log = EventLog(path)
+    log.add_game(GAME)
+    shares = session_columns(match_columns(scale=args.scale), args.sessions, args.split)
+    total = sum(len(share['type']) for share in shares)
+
+    start = time.perf_counter()
+    results = simulate(path, shares, args.mode, args.batch, args.pause)
+    elapsed = time.perf_counter() - start
+
+    expected = log.load(GAME)
+    _, last = log.events_since(GAME)
+    log.close()
+    for name in os.listdir(directory):
+        os.remove(os.path.join(directory, name))
+    os.rmdir(directory)
+
+    print(f'{args.sessions} {args.mode} tagged {total} events in {elapsed:.2f}s ({total / elapsed:.0f} events/s)')
+    print(f'{sum(result["polls"] for result in results)} polls pulled '
+          f'{sum(result["pulled"] for result in results) / sum(result["polls"] for result in results):.1f} events each')
+    failures = []
+    if last != total:
+        failures.append(f'the log holds sequence numbers up to {last}, expected {total}')
+    for number, result in enumerate(results):
+        if result['events'] != total or result['seq'] != last or result['digest'] != digest(expected):
+            failures.append(f'session {number} holds {result["events"]} events up to {result["seq"]}, differing from the log')
+    for failure in failures:
+        print(failure)
+    print('every session matches the log' if not failures else 'sessions diverged')
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
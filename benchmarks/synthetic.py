@@ -0,0 +1,86 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from registry import EVENT_TYPES, SUBTYPES, TEAMS
+
+
+# Rough per-team counts of one professional match, and how often each subtype occurs.
+MATCH_COUNTS = {'pass': 450, 'shot': 13, 'recovery': 50, 'assist': 1, 'duel': 20}
+SUBTYPE_WEIGHTS = {
+    'pass': [0.8, 0.08, 0.05, 0.07],
+    'shot': [0.11, 0.3, 0.37, 0.22],
+    'recovery': [0.5, 0.3, 0.2],
+    'assist': [0.6, 0.4],
+    'duel': [0.5, 0.5],
+}
+SQUAD_SIZE = 16
+
+
+def _locations(rng, event_type, count):
+    # x grows towards the opponent's goal; shots come from the box, assists from the final third.
+    if event_type == 'shot':
+        x = 120 - np.abs(rng.normal(0, 12, count))
+        y = np.clip(rng.normal(40, 9, count), 0, 80)
+    elif event_type == 'assist':
+        x = rng.uniform(85, 118, count)
+        y = np.where(rng.random(count) < 0.5, rng.uniform(0, 25, count), rng.uniform(55, 80, count))
+    elif event_type == 'recovery':
+        x = rng.triangular(0, 35, 120, count)
+        y = rng.uniform(0, 80, count)
+    else:
+        x = rng.triangular(0, 60, 120, count)
+        y = rng.uniform(0, 80, count)
+    return np.clip(x, 0, 120), y
+
+
+def match_columns(seed=0, scale=1.0, event_types=EVENT_TYPES):
+    # One match as the column arrays EventStore.extend and EventLog.append_many take,
+    # in minute order like a live log. scale multiplies every count.
+    rng = np.random.default_rng(seed)
+    parts = []
+    for event_type in event_types:
+        for team in TEAMS:
+            count = max(int(round(MATCH_COUNTS[event_type] * scale * rng.uniform(0.8, 1.2))), 1)
+            x, y = _locations(rng, event_type, count)
+            part = {
+                'type': np.full(count, event_type, dtype=object),
+                'player': np.array([f'{team} {number}' for number in rng.integers(1, SQUAD_SIZE + 1, count)], dtype=object),
+                'minute': rng.integers(0, 96, count),
+                'x': x,
+                'y': y,
+                'end_x': np.full(count, np.nan),
+                'end_y': np.full(count, np.nan),
+                'team': np.full(count, team, dtype=object),
+                'subtype': rng.choice(SUBTYPES[event_type], count, p=SUBTYPE_WEIGHTS[event_type]).astype(object),
+                'xg': np.full(count, np.nan),
+            }
+            if event_type in ('pass', 'assist'):
+                part['end_x'] = np.clip(x + rng.normal(8 if event_type == 'pass' else 10, 15, count), 0, 120)
+                part['end_y'] = np.clip(y + rng.normal(0, 15, count), 0, 80)
+            if event_type == 'shot':
+                distance = np.hypot(120 - x, 40 - y)
+                part['xg'] = np.clip(np.exp(-distance / 8) * rng.uniform(0.6, 1.4, count), 0.01, 0.95)
+            parts.append(part)
+    columns = {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+    order = np.argsort(columns['minute'], kind='stable')
+    return {name: column[order] for name, column in columns.items()}
+
+
+def season_columns(games, seed=0, scale=1.0):
+    # {game name: match columns} for a season of independent matches.
+    return {f'match {number:03d}': match_columns(seed + number, scale) for number in range(1, games + 1)}
+
+
+def event_columns(event_type, count, seed=0):
+    # Exactly count events of one type, drawn like those of a match.
+    scale = count / (MATCH_COUNTS[event_type] * len(TEAMS)) + 0.01
+    columns = match_columns(seed, scale, [event_type])
+    while len(columns['x']) < count:
+        seed += 1
+        more = match_columns(seed, scale, [event_type])
+        columns = {name: np.concatenate([columns[name], more[name]]) for name in columns}
+    return {name: column[:count] for name, column in columns.items()}
@@ -0,0 +1,265 @@
+import itertools
+from collections import OrderedDict
+
+import numpy as np
+
+from profiling import span
+from registry import EVENT_TYPES, SUBTYPE_FIELDS
+
+COLUMN_DTYPES = {
+    'x': np.float64,
+    'y': np.float64,
+    'end_x': np.float64,
+    'end_y': np.float64,
+    'xg': np.float64,
+    'minute': np.int16,
+    'team': np.int8,
+    'subtype': np.int16,
+    'player': np.int32,
+}
+
+# Every mutation of any table takes a fresh number, so (table, version) never repeats.
+_versions = itertools.count()
+
+
+class Interner:
+    def __init__(self):
+        self.values = []
+        self.codes = {}
+
+    def code(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+    def encode(self, values):
+        codes = {value: self.code(value) for value in dict.fromkeys(values)}
+        return np.fromiter((codes[value] for value in values), dtype=np.int64, count=len(values))
+
+    def decode(self, codes):
+        return np.asarray(self.values, dtype=object)[codes]
+
+    def clear(self):
+        self.values = []
+        self.codes = {}
+
+    def __len__(self):
+        return len(self.values)
+
+
+class EventView:
+    def __init__(self, event_type, columns, players, teams, subtypes):
+        self.event_type = event_type
+        self.subtype_field = SUBTYPE_FIELDS[event_type]
+        self.columns = columns
+        self.players = players
+        self.teams = teams
+        self.subtypes = subtypes
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__['columns'][name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __len__(self):
+        return len(self.columns['x'])
+
+    def take(self, rows):
+        columns = {name: column[rows] for name, column in self.columns.items()}
+        return EventView(self.event_type, columns, self.players, self.teams, self.subtypes)
+
+
+def dicts_to_columns(events):
+    # Event dicts as the forms build them, as the column arrays EventStore.extend and EventLog.append_many take.
+    columns = {name: np.array([event.get(name, np.nan) for event in events], dtype=np.float64)
+               for name in ('x', 'y', 'end_x', 'end_y', 'xg')}
+    columns['minute'] = np.array([event['minute'] for event in events], dtype=np.int64)
+    for name in ('type', 'player', 'team'):
+        columns[name] = np.array([event[name] for event in events], dtype=object)
+    columns['subtype'] = np.array([event.get(SUBTYPE_FIELDS[event['type']]) for event in events], dtype=object)
+    return columns
+
+
+def _sorted_union(groups):
+    if not groups:
+        return np.empty(0, dtype=np.int64)
+    return np.sort(np.concatenate(groups))
+
+
+class EventIndex:
+    # Row ids grouped by player, team and subtype code, plus every row ordered by minute,
+    # so a filter is a few dict lookups and two bisections rather than a scan of the table.
+    def __init__(self, generation):
+        self.generation = generation
+        self.size = 0
+        self.groups = {'player': {}, 'team': {}, 'subtype': {}}
+        self.minutes = np.empty(0, dtype=COLUMN_DTYPES['minute'])
+        self.minute_rows = np.empty(0, dtype=np.int64)
+
+    def add(self, events, start):
+        # Indexes the rows start.. of the table; events is the view of just those rows.
+        rows = np.arange(start, start + len(events))
+        for name, groups in self.groups.items():
+            codes = events.columns[name]
+            order = np.argsort(codes, kind='stable')
+            values, starts = np.unique(codes[order], return_index=True)
+            for value, group in zip(values.tolist(), np.split(rows[order], starts[1:])):
+                previous = groups.get(value)
+                groups[value] = group if previous is None else np.concatenate([previous, group])
+        # The indexed part is already sorted, so the stable sort of the concatenation is close to linear.
+        minutes = np.concatenate([self.minutes, events.minute])
+        order = np.argsort(minutes, kind='stable')
+        self.minutes = minutes[order]
+        self.minute_rows = np.concatenate([self.minute_rows, rows])[order]
+        self.size = start + len(events)
+
+    def rows(self, player=None, team=None, subtype=None, minutes=None):
+        # Sorted row ids matching every filter given; each of player, team and subtype is a
+        # list of codes and minutes a (first, last) pair. None means no filter at all.
+        selected = None
+        for name, codes in (('player', player), ('team', team), ('subtype', subtype)):
+            if codes is None:
+                continue
+            groups = self.groups[name]
+            rows = _sorted_union([groups[code] for code in codes if code in groups])
+            selected = rows if selected is None else np.intersect1d(selected, rows, assume_unique=True)
+        if minutes is not None:
+            low = np.searchsorted(self.minutes, minutes[0], side='left')
+            high = np.searchsorted(self.minutes, minutes[1], side='right')
+            rows = np.sort(self.minute_rows[low:high])
+            selected = rows if selected is None else np.intersect1d(selected, rows, assume_unique=True)
+        return selected
+
+
+class EventTable:
+    def __init__(self, event_type, players, teams, capacity=64):
+        self.event_type = event_type
+        self.players = players
+        self.teams = teams
+        self.subtypes = Interner()
+        self.size = 0
+        self.version = next(_versions)
+        # Changes whenever rows are removed or rewritten, i.e. on anything that is not an append.
+        self.generation = self.version
+        self._index = None
+        self._columns = {name: np.empty(capacity, dtype=dtype) for name, dtype in COLUMN_DTYPES.items()}
+
+    def __len__(self):
+        return self.size
+
+    def _reserve(self, size):
+        capacity = len(self._columns['x'])
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for name, column in self._columns.items():
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            self._columns[name] = grown
+
+    def extend(self, columns):
+        count = len(columns['x'])
+        self._reserve(self.size + count)
+        rows = slice(self.size, self.size + count)
+        for name in ('x', 'y', 'end_x', 'end_y', 'minute'):
+            self._columns[name][rows] = columns[name]
+        self._columns['xg'][rows] = columns.get('xg', np.nan)
+        self._columns['team'][rows] = self.teams.encode(columns['team'])
+        self._columns['subtype'][rows] = self.subtypes.encode(columns['subtype'])
+        self._columns['player'][rows] = self.players.encode(columns['player'])
+        self.size += count
+        self.version = next(_versions)
+
+    def clear(self):
+        self.size = 0
+        self.version = next(_versions)
+        self.generation = self.version
+
+    def view(self, start=0):
+        # Slices of the backing arrays, no copy is made.
+        columns = {name: column[start:self.size] for name, column in self._columns.items()}
+        return EventView(self.event_type, columns, self.players, self.teams, self.subtypes)
+
+    def index(self):
+        # Built on first use and then only extended with appended rows; a new generation rebuilds it.
+        index = self._index
+        if index is None or index.generation != self.generation:
+            index = self._index = EventIndex(self.generation)
+        if index.size < self.size:
+            index.add(self.view(index.size), index.size)
+        return index
+
+    def select(self, players=None, teams=None, subtypes=None, minutes=None):
+        # View of the rows matching the filters, which take labels rather than codes.
+        filters = {
+            'player': None if players is None else [self.players.codes.get(value) for value in players],
+            'team': None if teams is None else [self.teams.codes.get(value) for value in teams],
+            'subtype': None if subtypes is None else [self.subtypes.codes.get(value) for value in subtypes],
+            'minutes': minutes,
+        }
+        with span('filter'):
+            rows = self.index().rows(**filters)
+            if rows is None:
+                return self.view()
+            return self.view().take(rows)
+
+
+class EventStore:
+    def __init__(self, event_types=EVENT_TYPES):
+        self.players = Interner()
+        self.teams = Interner()
+        self.tables = {event_type: EventTable(event_type, self.players, self.teams) for event_type in event_types}
+        # Id of the game in the log and sequence number of the last event this store holds; see EventLog.sync.
+        self.game_id = None
+        self.seq = 0
+
+    def __getitem__(self, event_type):
+        return self.tables[event_type]
+
+    def items(self):
+        return self.tables.items()
+
+    def extend(self, columns):
+        # columns holds one array per field plus a 'type' array saying which table each row goes to.
+        for event_type, table in self.tables.items():
+            rows = columns['type'] == event_type
+            if rows.any():
+                table.extend({name: column[rows] for name, column in columns.items()})
+
+    def clear(self):
+        for table in self.tables.values():
+            table.clear()
+        self.players.clear()
+        self.teams.clear()
+        self.game_id = None
+        self.seq = 0
+
+
+class EventPartitions:
+    # One EventStore per game. Games are loaded on first access and the least recently
+    # used ones are evicted once more than max_open are held; evicted games reload from load_game.
+    def __init__(self, load_game, max_open=4):
+        self.load_game = load_game
+        self.max_open = max_open
+        self._games = OrderedDict()
+
+    def __getitem__(self, game):
+        store = self._games.get(game)
+        if store is None:
+            store = self._games[game] = self.load_game(game)
+            while len(self._games) > self.max_open:
+                self._games.popitem(last=False)
+        else:
+            self._games.move_to_end(game)
+        return store
+
+    def __iter__(self):
+        return iter(list(self._games))
+
+    def drop(self, game):
+        self._games.pop(game, None)
@@ -0,0 +1,120 @@
+import csv
+import importlib.util
+import os
+import tempfile
+
+import numpy as np
+
+from metrics import PASS_FLAGS, PASS_TYPES, pass_flags
+from profiling import span
+
+# xlsxwriter and pyarrow are imported by the writers that need them, so the app starts
+# without loading either; pyarrow stays optional.
+HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+
+# Same column order the single-DataFrame export used to produce, plus the shot xG and the
+# metrics.pass_flags of passes and assists.
+EXPORT_COLUMNS = ['player', 'minute', 'x', 'y', 'end_x', 'end_y', 'pass_type', 'team', 'type', 'game',
+                  'outcome', 'recovery_type', 'assist_type', 'xg'] + PASS_FLAGS
+FLOAT_COLUMNS = ['x', 'y', 'end_x', 'end_y', 'xg']
+CHUNK_SIZE = 5000
+
+FORMATS = {'xlsx': 'Excel (.xlsx)', 'csv': 'CSV (.csv)'}
+SEASON_FORMATS = {'xlsx': 'Excel (.xlsx)'}
+if HAS_PYARROW:
+    FORMATS['parquet'] = 'Parquet (.parquet)'
+    SEASON_FORMATS['parquet'] = 'Parquet dataset (.zip)'
+
+
+def iter_chunks(store, game, chunk_size=CHUNK_SIZE, filters=None):
+    # Yields dicts of equally long column arrays, at most chunk_size rows each,
+    # decoded straight from the store's columns. filters maps an event type to the
+    # keyword arguments of its table's select.
+    for event_type, table in store.items():
+        events = table.select(**filters[event_type]) if filters else table.view()
+        flags = pass_flags(events) if event_type in PASS_TYPES else None
+        for start in range(0, len(events), chunk_size):
+            rows = slice(start, start + chunk_size)
+            count = len(events.x[rows])
+            chunk = {name: np.full(count, None, dtype=object) for name in EXPORT_COLUMNS}
+            chunk['player'] = events.players.decode(events.player[rows])
+            chunk['minute'] = events.minute[rows]
+            for name in FLOAT_COLUMNS:
+                chunk[name] = events.columns[name][rows]
+            chunk[events.subtype_field] = events.subtypes.decode(events.subtype[rows])
+            chunk['team'] = events.teams.decode(events.team[rows])
+            chunk['type'] = np.full(count, event_type, dtype=object)
+            chunk['game'] = np.full(count, game, dtype=object)
+            if flags is not None:
+                for name in PASS_FLAGS:
+                    chunk[name] = flags[name][rows].astype(object)
+            yield chunk
+
+
+def chunk_rows(chunk):
+    # Missing floats become None so the writers leave the cell empty.
+    columns = []
+    for name in EXPORT_COLUMNS:
+        column = chunk[name]
+        if name in FLOAT_COLUMNS:
+            column = np.where(np.isnan(column), None, column)
+        columns.append(column.tolist())
+    return zip(*columns)
+
+
+def open_workbook(path):
+    # constant_memory flushes each row to disk as soon as the next one starts.
+    import xlsxwriter
+
+    return xlsxwriter.Workbook(path, {'constant_memory': True})
+
+
+def write_sheet(workbook, sheet_name, header, rows):
+    worksheet = workbook.add_worksheet(sheet_name)
+    worksheet.write_row(0, 0, header)
+    for row, cells in enumerate(rows, start=1):
+        worksheet.write_row(row, 0, cells)
+
+
+def write_xlsx(path, chunks, sheet_name='Events', summaries=()):
+    # summaries are (sheet name, header, rows) of extra sheets written after the events.
+    workbook = open_workbook(path)
+    write_sheet(workbook, sheet_name, EXPORT_COLUMNS, (cells for chunk in chunks for cells in chunk_rows(chunk)))
+    for summary_name, header, rows in summaries:
+        write_sheet(workbook, summary_name, header, rows)
+    workbook.close()
+
+
+def write_csv(path, chunks, **options):
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(EXPORT_COLUMNS)
+        for chunk in chunks:
+            writer.writerows(chunk_rows(chunk))
+
+
+def write_parquet(path, chunks, **options):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        (name, pa.float64() if name in FLOAT_COLUMNS else pa.int16() if name == 'minute'
+         else pa.bool_() if name in PASS_FLAGS else pa.string())
+        for name in EXPORT_COLUMNS
+    ])
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in chunks:
+            writer.write_table(pa.table({name: chunk[name] for name in EXPORT_COLUMNS}, schema=schema))
+
+
+WRITERS = {'xlsx': write_xlsx, 'csv': write_csv, 'parquet': write_parquet}
+
+
+def export_events(store, game, fmt, filters=None, **options):
+    # Writes to a temporary file and returns its path; the caller is responsible for deleting it.
+    fd, path = tempfile.mkstemp(suffix=f'.{fmt}', prefix='appplot-')
+    os.close(fd)
+    with span('export'):
+        WRITERS[fmt](path, iter_chunks(store, game, filters=filters), **options)
+    return path
@@ -0,0 +1,161 @@
+import json
+import os
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from registry import EVENT_TYPES, SUBTYPE_ALIASES, SUBTYPE_FIELDS, SUBTYPES, TEAM_ALIASES, TEAMS
+
+
+ARROW_TYPES = ['pass', 'assist']
+FLOAT_COLUMNS = ['x', 'y', 'end_x', 'end_y', 'xg']
+
+# StatsBomb shot outcomes grouped into the shot results used by the forms.
+STATSBOMB_SHOT_OUTCOMES = {
+    'Goal': 'goal',
+    'Saved': 'goalkeeper defense',
+    'Saved To Post': 'goalkeeper defense',
+    'Saved Off Target': 'goalkeeper defense',
+    'Off T': 'out',
+    'Wayward': 'out',
+    'Post': 'out',
+    'Blocked': 'blocked',
+}
+STATSBOMB_WON = {'Won', 'Success', 'Success In Play', 'Success Out'}
+STATSBOMB_AERIAL_KEYS = ['pass', 'clearance', 'shot', 'miscontrol']
+
+
+def statsbomb_rows(events, teams=TEAMS):
+    # Maps StatsBomb open-data events onto the app's event types and subtype keys; the
+    # team of the first event in the file is taken as home.
+    home = events[0]['team']['name'] if events else None
+    rows = []
+    for event in events:
+        if 'location' not in event or 'player' not in event:
+            continue
+        kind = event['type']['name']
+        details = event.get(kind.lower().replace(' ', '_'), {})
+        outcome = details.get('outcome', {}).get('name')
+        base = {
+            'player': event['player']['name'],
+            'minute': event['minute'],
+            'x': event['location'][0],
+            'y': event['location'][1],
+            'team': teams[0] if event['team']['name'] == home else teams[1],
+        }
+
+        row = None
+        if kind == 'Pass':
+            end_x, end_y = details['end_location'][:2]
+            row = dict(base, type='pass', subtype='pass', end_x=end_x, end_y=end_y)
+            if details.get('goal_assist') and (details.get('cross') or details.get('cut_back')):
+                row.update(type='assist', subtype='cross' if details.get('cross') else 'cutback')
+            elif details.get('through_ball') or details.get('technique', {}).get('name') == 'Through Ball':
+                row['subtype'] = 'through ball'
+            elif details.get('switch'):
+                row['subtype'] = 'switch'
+        elif kind == 'Shot' and outcome in STATSBOMB_SHOT_OUTCOMES:
+            row = dict(base, type='shot', subtype=STATSBOMB_SHOT_OUTCOMES[outcome], xg=details.get('statsbomb_xg'))
+        elif kind == 'Ball Recovery' and not details.get('recovery_failure'):
+            row = dict(base, type='recovery', subtype='recovery')
+        elif kind == 'Interception' and outcome in STATSBOMB_WON:
+            row = dict(base, type='recovery', subtype='interception')
+        elif kind == 'Duel' and details.get('type', {}).get('name') == 'Tackle' and outcome in STATSBOMB_WON:
+            row = dict(base, type='recovery', subtype='tackle')
+        elif kind == 'Duel' and details.get('type', {}).get('name') == 'Aerial Lost':
+            row = dict(base, type='duel', subtype='lost')
+        if row is not None:
+            rows.append(row)
+
+        # A won aerial is flagged on the pass, clearance, shot or miscontrol that came out of it.
+        if any(event.get(key, {}).get('aerial_won') for key in STATSBOMB_AERIAL_KEYS):
+            rows.append(dict(base, type='duel', subtype='won'))
+    return pd.DataFrame(rows)
+
+
+def read_events(file, file_name):
+    # Any file that can not be read as events raises ValueError, with the reason as its message.
+    extension = os.path.splitext(file_name)[1].lower()
+    if extension not in ('.csv', '.xlsx', '.xls', '.json'):
+        raise ValueError(f'Unsupported file type: {file_name}')
+    try:
+        if extension == '.csv':
+            return pd.read_csv(file)
+        if extension != '.json':
+            return pd.read_excel(file)
+        events = json.load(file)
+    except (ValueError, zipfile.BadZipFile) as error:
+        # Empty, malformed or wrongly encoded files; EmptyDataError, ParserError and JSONDecodeError are ValueErrors.
+        raise ValueError(f'{file_name} could not be read: {error}') from error
+    try:
+        return statsbomb_rows(events)
+    except (KeyError, TypeError, IndexError, AttributeError) as error:
+        raise ValueError(f'{file_name} is not a StatsBomb event list') from error
+
+
+def file_errors(message):
+    # The rejected-rows table of a file that could not be read at all.
+    return pd.DataFrame({'row': [None], 'problems': [message]})
+
+
+def normalize(frame):
+    frame = frame.reset_index(drop=True)
+    for name in ['type', 'player', 'team', 'subtype']:
+        if name not in frame:
+            frame[name] = None
+    for name in FLOAT_COLUMNS + ['minute']:
+        frame[name] = pd.to_numeric(frame[name], errors='coerce') if name in frame else np.nan
+    # The per-type subtype columns of the forms and of our own exports collapse into one. A blank
+    # subtype column is read as floats, which can not take the labels.
+    frame['subtype'] = frame['subtype'].astype(object)
+    for event_type, field in SUBTYPE_FIELDS.items():
+        if field in frame:
+            rows = (frame['type'] == event_type) & frame['subtype'].isna()
+            frame.loc[rows, 'subtype'] = frame.loc[rows, field]
+    # Files written with translated or older labels are read under the canonical keys.
+    for event_type, aliases in SUBTYPE_ALIASES.items():
+        rows = frame['type'] == event_type
+        frame.loc[rows, 'subtype'] = frame.loc[rows, 'subtype'].replace(aliases)
+    frame['team'] = frame['team'].replace(TEAM_ALIASES)
+    return frame
+
+
+def validate(frame, subtype_options=SUBTYPES, teams=TEAMS):
+    # Every check runs over whole columns; returns the valid rows and a table of the rejected ones.
+    frame = normalize(frame)
+    arrows = frame['type'].isin(ARROW_TYPES)
+    unknown_subtype = pd.Series(True, index=frame.index)
+    for event_type in EVENT_TYPES:
+        rows = frame['type'] == event_type
+        unknown_subtype[rows] = ~frame.loc[rows, 'subtype'].isin(subtype_options[event_type])
+    checks = pd.DataFrame({
+        'unknown event type': ~frame['type'].isin(EVENT_TYPES),
+        'missing player': frame['player'].isna(),
+        'minute outside 0-120': ~frame['minute'].between(0, 120),
+        'x outside 0-120': ~frame['x'].between(0, 120),
+        'y outside 0-80': ~frame['y'].between(0, 80),
+        'end x outside 0-120': arrows & ~frame['end_x'].between(0, 120),
+        'end y outside 0-80': arrows & ~frame['end_y'].between(0, 80),
+        'unknown team': ~frame['team'].isin(list(teams)),
+        'unknown subtype': unknown_subtype,
+    })
+    invalid = checks.any(axis=1)
+    rejected = checks[invalid]
+    errors = pd.DataFrame({
+        'row': rejected.index + 1,
+        'problems': [', '.join(rejected.columns[flags]) for flags in rejected.to_numpy()],
+    })
+    return frame[~invalid], errors
+
+
+def frame_columns(frame):
+    # The valid rows as the column arrays the event log and the event store take.
+    frame = frame.copy()
+    frame.loc[~frame['type'].isin(ARROW_TYPES), ['end_x', 'end_y']] = np.nan
+    frame.loc[frame['type'] != 'shot', 'xg'] = np.nan
+    columns = {name: frame[name].to_numpy(dtype=np.float64) for name in FLOAT_COLUMNS}
+    columns['minute'] = frame['minute'].to_numpy(dtype=np.int64)
+    for name in ['type', 'player', 'team', 'subtype']:
+        columns[name] = frame[name].astype(str).to_numpy(dtype=object)
+    return columns
@@ -0,0 +1,217 @@
+# Every user-facing string of the app, per language. Subtypes, teams and views are keyed
+# by the canonical keys of registry.EVENT_REGISTRY and analytics.SUMMARY_MODES.
+LOCALES = {
+    'en': {
+        'page_title': "Football Data Analysis",
+        'add_game_header': "Add new game",
+        'game_name': "Game name",
+        'add_game': "Add new game",
+        'game_added': "Game '{game}' added with success!",
+        'remove_game_header': "Delete Game",
+        'remove_game_select': "Select a Game to Delete",
+        'remove_game': "Delete Game",
+        'game_removed': "Game '{game}' removed with success!",
+        'game_not_found': "Game not found.",
+        'no_games': "No games available to delete.",
+        'select_game_header': "Select Game",
+        'select_game': "Selected Game",
+        'game_title': "Events for game: {game}",
+        'import_header': "Import events",
+        'import_file': "CSV, Excel or StatsBomb JSON",
+        'import_button': "Import events",
+        'imported': "{count} events imported with success!",
+        'skipped': "{count} rows were skipped.",
+        'filter_header': "Filter events",
+        'players': "Players",
+        'teams_label': "Teams",
+        'minutes': "Minutes",
+        'view': "View",
+        'show_only': "Show only",
+        'interactive': "Interactive pitch",
+        'download_png': "Download image (PNG)",
+        'entry_mode': "Entry",
+        'entry_modes': {'form': "Form", 'pitch': "Click on the pitch"},
+        'entry_arrows': "Click the start and then the end of each event. The other fields are kept for the next one.",
+        'entry_points': "Click where each event happened. The other fields are kept for the next one.",
+        'entry_undo': "Undo last click",
+        'entry_save': "Save {count} events",
+        'entry_saved': "{count} events saved with success!",
+        'player': "Player Name",
+        'minute': "Minute",
+        'team': "Team",
+        'fields': {
+            'x': "X",
+            'y': "Y",
+            'start_x': "Start X",
+            'start_y': "Start Y",
+            'end_x': "End X",
+            'end_y': "End Y",
+            'xg': "Expected goals (xG)",
+        },
+        'export_header': "Export events",
+        'export_format': "Format",
+        'export_download': "Download data table",
+        'export_file': "{game}_events",
+        'sheet_name': "Events",
+        'season_header': "Export season",
+        'season_format': "Season format",
+        'season_download': "Download season",
+        'season_file': "season",
+        'metrics_tab': "Summary",
+        'metrics': {
+            'shots': "Shots",
+            'goals': "Goals",
+            'xg': "xG",
+            'passes': "Passes",
+            'progressive_passes': "Progressive passes",
+            'final_third_entries': "Final third entries",
+            'box_entries': "Box entries",
+            'assists': "Assists",
+            'recoveries': "Recoveries",
+            'duels': "Aerial duels",
+            'duels_won': "Aerial duels won",
+            'duel_win_rate': "Aerial duel win rate",
+        },
+        'profile_header': "Profiling",
+        'profile_last': "Last rerun",
+        'profile_session': "p50 / p95 over {count} reruns",
+        'profile_next': "Profile next rerun",
+        'profile_download': "Download cProfile stats",
+        'event_types': {
+            'pass': {'tab': "Passes", 'title': "Passes", 'add': "Add Pass", 'subtype': "Pass Type",
+                     'added': "Pass added with success!", 'view': "View Passes"},
+            'shot': {'tab': "Shots", 'title': "Shots", 'add': "Add Shot", 'subtype': "Shot Result",
+                     'added': "Shot added with success!", 'view': "View shots"},
+            'recovery': {'tab': "Recoveries", 'title': "Recoveries", 'add': "Add Recovery", 'subtype': "Recovery type",
+                         'added': "Recovery added with success!", 'view': "View recoveries"},
+            'assist': {'tab': "Assists", 'title': "Assists", 'add': "Add Assist", 'subtype': "Assist Type",
+                       'added': "Assist added with success!", 'view': "View assists"},
+            'duel': {'tab': "Aerial Duels", 'title': "Aerial Duels", 'add': "Add Aerial duel", 'subtype': "Result",
+                     'added': "Aerial duel added with success!", 'view': "View aerial duels"},
+        },
+        'subtypes': {
+            'pass': {'pass': "pass", 'line breaking pass': "line breaking pass", 'switch': "switch",
+                     'through ball': "through ball"},
+            'shot': {'goal': "goal", 'goalkeeper defense': "goalkeeper defense", 'out': "out", 'blocked': "blocked"},
+            'recovery': {'recovery': "recovery", 'interception': "interception", 'tackle': "tackle"},
+            'assist': {'cross': "cross", 'cutback': "cutback"},
+            'duel': {'won': "won", 'lost': "lost"},
+        },
+        'teams': {'home': "home", 'away': "away"},
+        'views': {
+            'events': "Events",
+            'heatmap': "Heatmap",
+            'kde': "Density",
+            'network': "Pass network",
+            'zones': "Zone to zone",
+        },
+    },
+    'pt': {
+        'page_title': "Análise de dados no Futebol",
+        'add_game_header': "Adicionar Novo Jogo",
+        'game_name': "Nome do Jogo",
+        'add_game': "Adicionar Jogo",
+        'game_added': "Jogo '{game}' adicionado com sucesso!",
+        'remove_game_header': "Remover Jogo",
+        'remove_game_select': "Escolha um jogo para remover",
+        'remove_game': "Remover Jogo",
+        'game_removed': "Jogo '{game}' removido com sucesso!",
+        'game_not_found': "Jogo não encontrado.",
+        'no_games': "Nenhum jogo disponível para remover.",
+        'select_game_header': "Selecionar Jogo",
+        'select_game': "Escolha um jogo",
+        'game_title': "Eventos para o jogo: {game}",
+        'import_header': "Importar Eventos",
+        'import_file': "CSV, Excel ou JSON StatsBomb",
+        'import_button': "Importar Eventos",
+        'imported': "{count} eventos importados com sucesso!",
+        'skipped': "{count} linhas foram ignoradas.",
+        'filter_header': "Filtrar Eventos",
+        'players': "Jogadores",
+        'teams_label': "Equipas",
+        'minutes': "Minutos",
+        'view': "Visualização",
+        'show_only': "Mostrar apenas",
+        'interactive': "Campo interativo",
+        'download_png': "Download da imagem (PNG)",
+        'entry_mode': "Registo",
+        'entry_modes': {'form': "Formulário", 'pitch': "Clicar no campo"},
+        'entry_arrows': "Clique no início e depois no fim de cada evento. Os outros campos mantêm-se para o próximo.",
+        'entry_points': "Clique onde cada evento aconteceu. Os outros campos mantêm-se para o próximo.",
+        'entry_undo': "Desfazer último clique",
+        'entry_save': "Guardar {count} eventos",
+        'entry_saved': "{count} eventos guardados com sucesso!",
+        'player': "Nome do Jogador",
+        'minute': "Minuto",
+        'team': "Equipa",
+        'fields': {
+            'x': "Coordenada X",
+            'y': "Coordenada Y",
+            'start_x': "Coordenada X Inicial",
+            'start_y': "Coordenada Y Inicial",
+            'end_x': "Coordenada X Final",
+            'end_y': "Coordenada Y Final",
+            'xg': "Probabilidade de Golo (xG)",
+        },
+        'export_header': "Exportar Eventos",
+        'export_format': "Formato",
+        'export_download': "Download da Tabela dos dados",
+        'export_file': "{game}_eventos",
+        'sheet_name': "Eventos",
+        'season_header': "Exportar Época",
+        'season_format': "Formato da época",
+        'season_download': "Download da época",
+        'season_file': "epoca",
+        'metrics_tab': "Resumo",
+        'metrics': {
+            'shots': "Remates",
+            'goals': "Golos",
+            'xg': "xG",
+            'passes': "Passes",
+            'progressive_passes': "Passes progressivos",
+            'final_third_entries': "Entradas no último terço",
+            'box_entries': "Entradas na área",
+            'assists': "Assistências",
+            'recoveries': "Recuperações",
+            'duels': "Duelos aéreos",
+            'duels_won': "Duelos aéreos ganhos",
+            'duel_win_rate': "Taxa de duelos aéreos ganhos",
+        },
+        'profile_header': "Perfil de desempenho",
+        'profile_last': "Última execução",
+        'profile_session': "p50 / p95 em {count} execuções",
+        'profile_next': "Perfilar a próxima execução",
+        'profile_download': "Download das estatísticas cProfile",
+        'event_types': {
+            'pass': {'tab': "Passes", 'title': "Passes", 'add': "Adicionar Passe", 'subtype': "Tipo de Passe",
+                     'added': "Passe adicionado com sucesso!", 'view': "Visualizar Passes"},
+            'shot': {'tab': "Remates", 'title': "Remates", 'add': "Adicionar Remate", 'subtype': "Resultado",
+                     'added': "Remate adicionado com sucesso!", 'view': "Visualizar Remates"},
+            'recovery': {'tab': "Recuperações", 'title': "Recuperações", 'add': "Adicionar Recuperação",
+                         'subtype': "Tipo de Recuperação", 'added': "Recuperação adicionada com sucesso!",
+                         'view': "Visualizar Recuperações"},
+            'assist': {'tab': "Assistências", 'title': "Assistências", 'add': "Adicionar Assistência",
+                       'subtype': "Tipo de Assistência", 'added': "Assistência adicionada com sucesso!",
+                       'view': "Visualizar Assistências"},
+            'duel': {'tab': "Duelos Aéreos", 'title': "Duelos Aéreos", 'add': "Adicionar Duelo Aéreo",
+                     'subtype': "Resultado", 'added': "Duelo Aéreo adicionado com sucesso!",
+                     'view': "Visualizar Duelos Aéreos"},
+        },
+        'subtypes': {
+            'pass': {'pass': "passe normal", 'line breaking pass': "passe quebra linhas", 'switch': "variação do CJ",
+                     'through ball': "passe em profundidade"},
+            'shot': {'goal': "golo", 'goalkeeper defense': "defesa", 'out': "para fora", 'blocked': "bloqueado"},
+            'recovery': {'recovery': "recuperação", 'interception': "interceção", 'tackle': "desarme"},
+            'assist': {'cross': "cruzamento", 'cutback': "passe atrasado"},
+            'duel': {'won': "ganho", 'lost': "perdido"},
+        },
+        'teams': {'home': "casa", 'away': "fora"},
+        'views': {
+            'events': "Eventos",
+            'heatmap': "Mapa de calor",
+            'kde': "Densidade",
+            'network': "Rede de passes",
+            'zones': "Zona a zona",
+        },
+    },
+}
@@ -0,0 +1,122 @@
+import numpy as np
+
+from profiling import span
+
+
+PITCH_LENGTH = 120
+GOAL_Y = 40
+FINAL_THIRD_X = 80
+BOX_X = 102
+BOX_Y = (18, 62)
+# A pass is progressive when it ends at least this share closer to the centre of the goal than it started.
+PROGRESSIVE_SHARE = 0.25
+# Assists are passes too: their progressions and entries count along with the passes'.
+PASS_TYPES = ('pass', 'assist')
+PASS_FLAGS = ['progressive', 'final_third_entry', 'box_entry']
+
+# Additive totals per player and per team; the duel win rate is derived from the last two.
+TOTALS = ['shots', 'goals', 'xg', 'passes', 'progressive_passes', 'final_third_entries', 'box_entries', 'assists',
+          'recoveries', 'duels', 'duels_won']
+METRICS = TOTALS + ['duel_win_rate']
+
+
+def _in_box(x, y):
+    return (x >= BOX_X) & (y >= BOX_Y[0]) & (y <= BOX_Y[1])
+
+
+def pass_flags(events):
+    # One boolean array per PASS_FLAGS entry, for a view of passes or assists.
+    start = np.hypot(PITCH_LENGTH - events.x, GOAL_Y - events.y)
+    end = np.hypot(PITCH_LENGTH - events.end_x, GOAL_Y - events.end_y)
+    return {
+        'progressive': end <= start * (1 - PROGRESSIVE_SHARE),
+        'final_third_entry': (events.x < FINAL_THIRD_X) & (events.end_x >= FINAL_THIRD_X),
+        'box_entry': ~_in_box(events.x, events.y) & _in_box(events.end_x, events.end_y),
+    }
+
+
+def _is_subtype(events, subtype):
+    code = events.subtypes.codes.get(subtype)
+    if code is None:
+        return np.zeros(len(events), dtype=bool)
+    return events.subtype == code
+
+
+def event_totals(events):
+    # What each row of the view adds to the TOTALS of its player and its team.
+    ones = np.ones(len(events))
+    if events.event_type == 'shot':
+        return {'shots': ones, 'goals': _is_subtype(events, 'goal'), 'xg': np.nan_to_num(events.xg)}
+    if events.event_type in PASS_TYPES:
+        flags = pass_flags(events)
+        totals = {'progressive_passes': flags['progressive'], 'final_third_entries': flags['final_third_entry'],
+                  'box_entries': flags['box_entry']}
+        totals['passes' if events.event_type == 'pass' else 'assists'] = ones
+        return totals
+    if events.event_type == 'recovery':
+        return {'recoveries': ones}
+    if events.event_type == 'duel':
+        return {'duels': ones, 'duels_won': _is_subtype(events, 'won')}
+    return {}
+
+
+def _grown(totals, size):
+    if len(totals) >= size:
+        return totals
+    grown = np.zeros(size, dtype=totals.dtype)
+    grown[:len(totals)] = totals
+    return grown
+
+
+class Metrics:
+    # TOTALS per player code and per team code of one game. update only reads the rows
+    # appended since it last ran, like EventTable.index. It keeps each table's generation,
+    # not the store: generations are never reused, so a cleared table, or a new store after
+    # the game was evicted and reloaded, starts it over.
+    def __init__(self):
+        self.sizes = {}
+        self.players = {name: np.zeros(0) for name in TOTALS}
+        self.teams = {name: np.zeros(0) for name in TOTALS}
+        # The team of each player's latest event.
+        self.player_teams = np.zeros(0, dtype=np.int64)
+
+    def update(self, store):
+        with span('metrics'):
+            if any(self.sizes.get(event_type, (table.generation,))[0] != table.generation
+                   for event_type, table in store.items()):
+                self.__init__()
+            for event_type, table in store.items():
+                size = self.sizes.get(event_type, (table.generation, 0))[1]
+                if size < table.size:
+                    self.add(table.view(size))
+                self.sizes[event_type] = (table.generation, table.size)
+        return self
+
+    def add(self, events):
+        # Adds a view of any rows, e.g. a filtered selection when the totals are built from scratch.
+        players, teams = len(events.players), len(events.teams)
+        self.player_teams = _grown(self.player_teams, players)
+        self.player_teams[events.player] = events.team
+        for name in TOTALS:
+            self.players[name] = _grown(self.players[name], players)
+            self.teams[name] = _grown(self.teams[name], teams)
+        for name, values in event_totals(events).items():
+            self.players[name] += np.bincount(events.player, weights=values, minlength=players)
+            self.teams[name] += np.bincount(events.team, weights=values, minlength=teams)
+        return self
+
+    def table(self, store, by='player'):
+        # One row per player (with their team) or per team that has any events, as columns.
+        totals = self.players if by == 'player' else self.teams
+        codes = np.flatnonzero(sum(totals[name] for name in TOTALS) > 0)
+        columns = {}
+        if by == 'player':
+            columns['player'] = store.players.decode(codes)
+            columns['team'] = store.teams.decode(self.player_teams[codes])
+        else:
+            columns['team'] = store.teams.decode(codes)
+        for name in TOTALS:
+            columns[name] = totals[name][codes] if name == 'xg' else totals[name][codes].astype(np.int64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            columns['duel_win_rate'] = np.where(columns['duels'] > 0, columns['duels_won'] / columns['duels'], np.nan)
+        return columns
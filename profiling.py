@@ -0,0 +1,112 @@
+import contextlib
+import cProfile
+import io
+import os
+import pstats
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+import numpy as np
+
+
+# APPPLOT_PROFILE=1 turns on the spans, counters and the debug panel. When it is unset,
+# span returns one shared no-op context manager and count returns immediately.
+ENABLED = os.environ.get('APPPLOT_PROFILE', '') not in ('', '0')
+PROFILE_LINES = 30
+
+_local = threading.local()
+
+
+class Rerun:
+    # What one script run spent per span, plus its counters. Nested spans are timed on
+    # their own too, but only the outermost ones count towards the covered time.
+    def __init__(self):
+        self.timings = defaultdict(float)
+        self.calls = defaultdict(int)
+        self.counts = defaultdict(int)
+        self.depth = 0
+        self.covered = 0.0
+        self.total = 0.0
+        self.profile_path = None
+        self.profile_text = None
+        self._start = time.perf_counter()
+
+    def breakdown(self):
+        # Seconds per span and total, with the rest of the run (widgets, Streamlit itself) as 'other'.
+        timings = dict(self.timings)
+        timings['other'] = max(self.total - self.covered, 0.0)
+        timings['total'] = self.total
+        return timings
+
+
+@contextlib.contextmanager
+def _span(name):
+    record = getattr(_local, 'rerun', None)
+    if record is None:
+        yield
+        return
+    start = time.perf_counter()
+    record.depth += 1
+    try:
+        yield
+    finally:
+        record.depth -= 1
+        elapsed = time.perf_counter() - start
+        record.timings[name] += elapsed
+        record.calls[name] += 1
+        if not record.depth:
+            record.covered += elapsed
+
+
+def _count(name, value=1):
+    record = getattr(_local, 'rerun', None)
+    if record is not None:
+        record.counts[name] += value
+
+
+_NO_SPAN = contextlib.nullcontext()
+
+
+def _no_span(name):
+    return _NO_SPAN
+
+
+def _no_count(name, value=1):
+    pass
+
+
+span = _span if ENABLED else _no_span
+count = _count if ENABLED else _no_count
+
+
+@contextlib.contextmanager
+def rerun(profile=False):
+    # Records every span and counter of the current thread until the block exits. With
+    # profile, the run also goes through cProfile and its stats are dumped to a temp file.
+    record = Rerun()
+    _local.rerun = record
+    profiler = cProfile.Profile() if profile else None
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield record
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            fd, record.profile_path = tempfile.mkstemp(suffix='.prof', prefix='appplot-rerun-')
+            os.close(fd)
+            profiler.dump_stats(record.profile_path)
+            text = io.StringIO()
+            pstats.Stats(profiler, stream=text).sort_stats('cumulative').print_stats(PROFILE_LINES)
+            record.profile_text = text.getvalue()
+        record.total = time.perf_counter() - record._start
+        _local.rerun = None
+
+
+def percentiles(records, quantiles=(50, 95)):
+    # {span: [milliseconds at each quantile]} over the given reruns; a span a rerun did not enter counts as 0.
+    names = sorted({name for record in records for name in record.breakdown()})
+    timings = np.array([[record.breakdown().get(name, 0.0) for name in names] for record in records]) * 1000
+    return {name: np.percentile(timings[:, column], quantiles).tolist() for column, name in enumerate(names)}
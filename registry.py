@@ -0,0 +1,92 @@
+from locales import LOCALES
+
+
+TEAMS = ['home', 'away']
+
+# Everything the app knows about an event type. Subtypes and teams are stored, drawn and
+# exported under these canonical keys; only the forms and legends translate them.
+EVENT_REGISTRY = {
+    'pass': {
+        'subtype_field': 'pass_type',
+        'fields': ['x', 'y', 'end_x', 'end_y'],
+        'subtypes': ['pass', 'line breaking pass', 'switch', 'through ball'],
+        'colors': {
+            'home': {'line breaking pass': 'red', 'switch': 'blue', 'through ball': 'green', 'pass': 'black'},
+            'away': {'line breaking pass': 'orange', 'switch': 'cyan', 'through ball': 'purple', 'pass': 'gray'},
+        },
+        # (mplsoccer method, fallback color, style kwargs)
+        'style': ('arrows', 'black', {'width': 2}),
+    },
+    'shot': {
+        'subtype_field': 'outcome',
+        'fields': ['x', 'y', 'xg'],
+        'subtypes': ['goal', 'goalkeeper defense', 'out', 'blocked'],
+        'colors': {
+            'home': {'goal': 'red', 'goalkeeper defense': 'blue', 'out': 'green', 'blocked': 'brown'},
+            'away': {'goal': 'green', 'goalkeeper defense': 'blue', 'out': 'black', 'blocked': 'orange'},
+        },
+        'style': ('scatter', 'red', {'s': 100}),
+    },
+    'recovery': {
+        'subtype_field': 'recovery_type',
+        'fields': ['x', 'y'],
+        'subtypes': ['recovery', 'interception', 'tackle'],
+        'colors': {
+            'home': {'interception': 'green', 'tackle': 'blue', 'recovery': 'orange'},
+            'away': {'interception': 'purple', 'tackle': 'cyan', 'recovery': 'yellow'},
+        },
+        'style': ('scatter', 'orange', {'s': 100}),
+    },
+    'assist': {
+        'subtype_field': 'assist_type',
+        'fields': ['x', 'y', 'end_x', 'end_y'],
+        'subtypes': ['cross', 'cutback'],
+        'colors': {
+            'home': {'cross': 'orange', 'cutback': 'blue'},
+            'away': {'cross': 'purple', 'cutback': 'cyan'},
+        },
+        'style': ('arrows', 'orange', {'width': 2}),
+    },
+    'duel': {
+        'subtype_field': 'outcome',
+        'fields': ['x', 'y'],
+        'subtypes': ['won', 'lost'],
+        'colors': {
+            'home': {'won': 'green', 'lost': 'red'},
+            'away': {'won': 'blue', 'lost': 'yellow'},
+        },
+        'style': ('scatter', 'gray', {'s': 150, 'marker': '^'}),
+    },
+}
+
+# Number inputs of the forms: (min, max, step).
+FIELD_INPUTS = {
+    'x': (0.0, 120.0, 0.1),
+    'y': (0.0, 80.0, 0.1),
+    'end_x': (0.0, 120.0, 0.1),
+    'end_y': (0.0, 80.0, 0.1),
+    'xg': (0.0, 1.0, 0.01),
+}
+
+EVENT_TYPES = list(EVENT_REGISTRY)
+SUBTYPE_FIELDS = {event_type: spec['subtype_field'] for event_type, spec in EVENT_REGISTRY.items()}
+SUBTYPES = {event_type: spec['subtypes'] for event_type, spec in EVENT_REGISTRY.items()}
+
+# Labels older versions of the forms stored instead of the canonical keys.
+LEGACY_SUBTYPES = {
+    'pass': {'line braking pass': 'line breaking pass'},
+    'shot': {'defense': 'goalkeeper defense'},
+    'recovery': {},
+    'assist': {},
+    'duel': {'aerial won': 'won', 'aerial loss': 'lost', 'loss': 'lost'},
+}
+
+# Every label a subtype or team has been written under, mapped to its canonical key.
+SUBTYPE_ALIASES = {
+    event_type: dict(LEGACY_SUBTYPES[event_type], **{
+        label: key for locale in LOCALES.values() for key, label in locale['subtypes'][event_type].items()
+        if label != key
+    })
+    for event_type in EVENT_TYPES
+}
+TEAM_ALIASES = {label: key for locale in LOCALES.values() for key, label in locale['teams'].items() if label != key}
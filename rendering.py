@@ -0,0 +1,270 @@
+import functools
+import io
+import threading
+from collections import OrderedDict
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from PIL import Image
+
+from profiling import count, span
+from registry import EVENT_REGISTRY
+
+
+EVENT_STYLES = {event_type: spec['style'] for event_type, spec in EVENT_REGISTRY.items()}
+
+# (team, subtype) -> color for every event type, flattened once at import.
+EVENT_COLORS = {
+    event_type: {
+        (team, subtype): color
+        for team, team_colors in spec['colors'].items() for subtype, color in team_colors.items()
+    }
+    for event_type, spec in EVENT_REGISTRY.items()
+}
+
+
+@functools.cache
+def shared_pitch():
+    # One Pitch for every figure. mplsoccer pulls in pandas and scipy, so it is only
+    # imported when the first pitch is drawn rather than when the app starts.
+    from mplsoccer import Pitch
+    return Pitch(pitch_type='statsbomb', pitch_color='white', line_color='black', goal_type="box", corner_arcs=True)
+
+
+def legend(event_type, title, team_labels, subtype_labels):
+    # The labels translate the canonical team and subtype keys for the legend entries.
+    method, _, style = EVENT_STYLES[event_type]
+    handles = []
+    for (team, subtype), color in EVENT_COLORS[event_type].items():
+        label = f'{team_labels[team]} - {subtype_labels[subtype]}'
+        if method == 'arrows':
+            handles.append(plt.Line2D([0], [0], color=color, lw=2, label=label))
+        else:
+            handles.append(plt.Line2D([0], [0], color=color, marker=style.get('marker', 'o'), lw=0, label=label))
+    return title, handles
+
+
+def color_groups(events):
+    # Yields (color, row ids) once per (team, subtype) pair present in the events.
+    _, fallback, _ = EVENT_STYLES[events.event_type]
+    colors = EVENT_COLORS[events.event_type]
+    if not len(events):
+        return
+    n_subtypes = max(len(events.subtypes), 1)
+    keys = events.team.astype(np.int64) * n_subtypes + events.subtype
+    order = np.argsort(keys, kind='stable')
+    group_keys, starts = np.unique(keys[order], return_index=True)
+    for key, rows in zip(group_keys, np.split(order, starts[1:])):
+        team = events.teams.values[key // n_subtypes]
+        subtype = events.subtypes.values[key % n_subtypes]
+        yield colors.get((team, subtype), fallback), rows
+
+
+def plot_events(pitch, ax, events):
+    method, _, style = EVENT_STYLES[events.event_type]
+    count('events drawn', len(events))
+    artists = []
+    for color, rows in color_groups(events):
+        if method == 'arrows':
+            artists.append(pitch.arrows(events.x[rows], events.y[rows], events.end_x[rows], events.end_y[rows], ax=ax, color=color, **style))
+        else:
+            artists.append(pitch.scatter(events.x[rows], events.y[rows], ax=ax, color=color, **style))
+    return artists
+
+
+def pitch_figure(legend):
+    count('figures created')
+    pitch = shared_pitch()
+    fig, ax = plt.subplots(figsize=(10, 7))
+    pitch.draw(ax=ax)
+    title, handles = legend
+    ax.legend(handles=handles, loc='center left', bbox_to_anchor=(1, 0.5), title=title)
+    return pitch, fig, ax
+
+
+def draw_events(events, legend):
+    with span('render'):
+        pitch, fig, ax = pitch_figure(legend)
+        plot_events(pitch, ax, events)
+    return fig
+
+
+TEAM_NETWORK_COLORS = ['red', 'blue']
+TOP_ZONE_FLOWS = 15
+
+
+def plot_grid(pitch, ax, summary, cmap):
+    pitch.heatmap(summary, ax=ax, cmap=cmap, edgecolors='white' if cmap == 'Reds' else None, zorder=0.5)
+
+
+def plot_network(pitch, ax, summary):
+    for color, (team, network) in zip(TEAM_NETWORK_COLORS, summary.items()):
+        if len(network['count']):
+            widths = 1 + 9 * network['count'] / network['count'].max()
+            pitch.lines(network['x'][network['from']], network['y'][network['from']],
+                        network['x'][network['to']], network['y'][network['to']],
+                        ax=ax, lw=widths, color=color, alpha=0.4, zorder=1)
+        pitch.scatter(network['x'], network['y'], ax=ax, s=100 + 900 * network['passes'] / network['passes'].max(),
+                      color=color, edgecolors='black', zorder=2, label=team)
+        for player, x, y in zip(network['players'], network['x'], network['y']):
+            pitch.annotate(player, (x, y), ax=ax, va='center', ha='center', fontsize=8, zorder=3)
+    if summary:
+        ax.legend(loc='center left', bbox_to_anchor=(1, 0.5))
+
+
+def plot_zones(pitch, ax, summary):
+    plot_grid(pitch, ax, summary['outgoing'], 'Blues')
+    matrix = summary['matrix'].astype(float)
+    np.fill_diagonal(matrix, 0)
+    flows = np.argsort(matrix, axis=None)[::-1][:TOP_ZONE_FLOWS]
+    start, end = np.unravel_index(flows, matrix.shape)
+    keep = matrix[start, end] > 0
+    start, end = start[keep], end[keep]
+    for a, b in zip(start, end):
+        pitch.arrows(summary['center_x'][a], summary['center_y'][a], summary['center_x'][b], summary['center_y'][b],
+                     ax=ax, width=1 + 4 * matrix[a, b] / matrix.max(), color='black', alpha=0.7, zorder=2)
+
+
+SUMMARY_PLOTS = {
+    'heatmap': lambda pitch, ax, summary: plot_grid(pitch, ax, summary, 'Reds'),
+    'kde': lambda pitch, ax, summary: plot_grid(pitch, ax, summary, 'magma_r'),
+    'network': plot_network,
+    'zones': plot_zones,
+}
+
+
+def draw_summary(summary, mode, title):
+    # The figure size only depends on the summary grid or network, never on the event count.
+    with span('render'):
+        count('figures created')
+        pitch = shared_pitch()
+        fig, ax = plt.subplots(figsize=(10, 7))
+        pitch.draw(ax=ax)
+        SUMMARY_PLOTS[mode](pitch, ax, summary)
+        ax.set_title(title)
+    return fig
+
+
+def figure_png(fig):
+    # savefig rasterizes the figure as well as compressing it, so both land in 'encode'.
+    with span('encode'):
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png', bbox_inches='tight')
+        plt.close(fig)
+    return buffer.getvalue()
+
+
+class LRUCache:
+    # Rendered PNGs and analytics summaries keyed on (game, event type, ..., table version),
+    # least recently used evicted first.
+    def __init__(self, max_size=16):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        png = self._entries.get(key)
+        if png is not None:
+            self._entries.move_to_end(key)
+        return png
+
+    def put(self, key, png):
+        self._entries[key] = png
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def drop(self, game):
+        for key in [key for key in self._entries if key[0] == game]:
+            del self._entries[key]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def figure_rgba(fig):
+    canvas = FigureCanvasAgg(fig)
+    canvas.draw()
+    return np.array(canvas.buffer_rgba())
+
+
+def rgba_png(rgba):
+    # Fast zlib level: the layers are re-encoded on every add, size matters less than latency.
+    with span('encode'):
+        buffer = io.BytesIO()
+        Image.fromarray(rgba[:, :, :3]).save(buffer, format='png', compress_level=1)
+    return buffer.getvalue()
+
+
+class PitchCanvas:
+    # A pre-rendered blank pitch for one event type, plus a transparent twin of the
+    # same figure on which only new events are drawn and then composited.
+    def __init__(self, event_type, legend):
+        self.event_type = event_type
+        self._lock = threading.Lock()
+
+        _, fig, ax = pitch_figure(legend)
+        fig.tight_layout()
+        self.background = figure_rgba(fig)
+        rows, cols = np.nonzero(self.background[:, :, :3].min(axis=2) < 255)
+        self.crop = np.s_[max(rows.min() - 10, 0):rows.max() + 11, max(cols.min() - 10, 0):cols.max() + 11]
+        position = ax.get_position(original=True)
+        plt.close(fig)
+
+        self.pitch, self.fig, self.ax = pitch_figure(legend)
+        plt.close(self.fig)
+        self.ax.set_position(position)
+        for artist in self.ax.get_children():
+            artist.set_visible(False)
+        self.fig.patch.set_alpha(0)
+
+    def composite(self, rgba, events):
+        if not len(events):
+            return
+        with span('render'):
+            with self._lock:
+                artists = plot_events(self.pitch, self.ax, events)
+                overlay = figure_rgba(self.fig)
+                for artist in artists:
+                    artist.remove()
+
+            rows, cols = np.nonzero(overlay[:, :, 3])
+            if not len(rows):
+                return
+            window = np.s_[rows.min():rows.max() + 1, cols.min():cols.max() + 1]
+            top = overlay[window].astype(np.float32)
+            alpha = top[:, :, 3:] / 255.0
+            bottom = rgba[window][:, :, :3].astype(np.float32)
+            rgba[window][:, :, :3] = np.rint(top[:, :, :3] * alpha + bottom * (1 - alpha)).astype(np.uint8)
+
+    def render(self, events):
+        # A one-off PNG of just these events, e.g. a filtered view, without touching any layer.
+        rgba = self.background.copy()
+        self.composite(rgba, events)
+        return rgba_png(rgba[self.crop])
+
+
+class PitchLayers:
+    # One raster per (game, event type) holding every event drawn so far. Appended
+    # events are composited on top; anything else rebuilds the layer from the background.
+    def __init__(self, max_size=10):
+        self.max_size = max_size
+        self._layers = OrderedDict()
+
+    def render(self, key, canvas, table):
+        layer = self._layers.pop(key, None)
+        if layer is None or layer['generation'] != table.generation or layer['size'] > table.size:
+            layer = {'rgba': canvas.background.copy(), 'generation': table.generation, 'size': 0}
+        if table.size > layer['size']:
+            canvas.composite(layer['rgba'], table.view(layer['size']))
+            layer['size'] = table.size
+        self._layers[key] = layer
+        while len(self._layers) > self.max_size:
+            self._layers.popitem(last=False)
+        return rgba_png(layer['rgba'][canvas.crop])
+
+    def drop(self, game):
+        for key in [key for key in self._layers if key[0] == game]:
+            del self._layers[key]
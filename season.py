@@ -0,0 +1,123 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import pandas as pd
+
+from export import EXPORT_COLUMNS, chunk_rows, iter_chunks, open_workbook, write_parquet, write_sheet
+from metrics import TOTALS, Metrics
+from storage import EventLog
+
+
+# Index columns of the summaries; the player table's order matches Metrics.table.
+SUMMARY_KEYS = {'player': ['player', 'team'], 'team': ['team']}
+
+
+def pass_type_counts(store, keys):
+    # Pass counts by pass type, which the metrics do not split.
+    passes = store['pass'].view()
+    frame = pd.DataFrame({'player': passes.players.decode(passes.player), 'team': passes.teams.decode(passes.team),
+                          'pass_type': passes.subtypes.decode(passes.subtype)})
+    return frame.groupby(keys + ['pass_type']).size().unstack('pass_type').add_prefix('passes - ')
+
+
+def summarize(store, metrics, by):
+    # Additive per-key totals, so the results of several games can simply be summed; the
+    # duel win rate is derived again once they are.
+    keys = SUMMARY_KEYS[by]
+    columns = metrics.table(store, by)
+    del columns['duel_win_rate']
+    summary = pd.DataFrame(columns).set_index(keys)
+    return summary.join(pass_type_counts(store, keys), how='outer').fillna(0)
+
+
+def summarize_game(db_path, game, parquet_path=None):
+    # Runs in a worker process: reads one game from the log and aggregates it. Only the
+    # aggregates go back to the parent; the events stay in the worker or its Parquet part.
+    log = EventLog(db_path)
+    try:
+        store = log.load(game)
+    finally:
+        log.close()
+    if parquet_path is not None:
+        write_parquet(parquet_path, iter_chunks(store, game))
+    metrics = Metrics().update(store)
+    return {by: summarize(store, metrics, by) for by in SUMMARY_KEYS}
+
+
+def season_rows(db_path, games):
+    # Every game's event rows, one game loaded at a time, for the constant-memory workbook.
+    log = EventLog(db_path)
+    try:
+        for game in games:
+            for chunk in iter_chunks(log.load(game), game):
+                yield from chunk_rows(chunk)
+    finally:
+        log.close()
+
+
+def merge(results, by, headers=None, team_names=None):
+    # One table of the summed totals, in the column order of Metrics.table followed by the
+    # pass types, with the headers and team names of the per-game export when given.
+    keys = SUMMARY_KEYS[by]
+    frames = [result[by] for result in results if len(result[by])]
+    if frames:
+        summary = pd.concat(frames).groupby(level=keys).sum()
+    else:
+        summary = pd.DataFrame(columns=keys + TOTALS).set_index(keys)
+    pass_types = sorted(column for column in summary.columns if column not in TOTALS)
+    summary = summary.astype({name: 'int64' for name in TOTALS + pass_types if name != 'xg'})
+    summary['duel_win_rate'] = summary['duels_won'] / summary['duels'].where(summary['duels'] > 0)
+    summary = summary[TOTALS + ['duel_win_rate'] + pass_types].reset_index()
+    if team_names:
+        summary['team'] = summary['team'].map(lambda team: team_names.get(team, team))
+    if headers:
+        summary = summary.rename(columns=headers)
+    return summary
+
+
+def frame_rows(frame):
+    return frame.astype(object).where(frame.notna(), None).itertuples(index=False)
+
+
+def export_season(db_path, games, fmt, headers=None, team_names=None, workers=None):
+    # Summarizes every game in its own process and returns the path of one temporary
+    # file: an xlsx workbook, or a zip holding a Parquet dataset. headers maps the summary
+    # columns to their titles and team_names the team keys to their labels.
+    output_dir = tempfile.mkdtemp(prefix='appplot-season-')
+    parquet_paths = [None] * len(games)
+    if fmt == 'parquet':
+        os.makedirs(os.path.join(output_dir, 'events'))
+        parquet_paths = [os.path.join(output_dir, 'events', f'part-{index:04d}.parquet') for index in range(len(games))]
+
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        results = list(pool.map(summarize_game, repeat(db_path), games, parquet_paths))
+
+    players = merge(results, 'player', headers, team_names)
+    teams = merge(results, 'team', headers, team_names)
+
+    fd, path = tempfile.mkstemp(suffix='.xlsx' if fmt == 'xlsx' else '.zip', prefix='appplot-season-')
+    os.close(fd)
+    try:
+        if fmt == 'xlsx':
+            workbook = open_workbook(path)
+            write_sheet(workbook, 'Events', EXPORT_COLUMNS, season_rows(db_path, games))
+            write_sheet(workbook, 'Players', list(players.columns), frame_rows(players))
+            write_sheet(workbook, 'Teams', list(teams.columns), frame_rows(teams))
+            workbook.close()
+        else:
+            players.to_parquet(os.path.join(output_dir, 'players.parquet'), index=False)
+            teams.to_parquet(os.path.join(output_dir, 'teams.parquet'), index=False)
+            with zipfile.ZipFile(path, 'w') as archive:
+                for root, _, files in os.walk(output_dir):
+                    for name in files:
+                        file_path = os.path.join(root, name)
+                        archive.write(file_path, os.path.relpath(file_path, output_dir))
+    finally:
+        shutil.rmtree(output_dir)
+    return path
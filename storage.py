@@ -0,0 +1,156 @@
+import os
+import sqlite3
+import threading
+
+import numpy as np
+
+from events import SUBTYPE_FIELDS, EventStore
+from profiling import span
+
+
+DEFAULT_PATH = os.environ.get('APPPLOT_DB', 'appplot.db')
+
+# AUTOINCREMENT never hands out a game id again, so a game removed and added back gets a new one.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS events (
+    game TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    player TEXT,
+    minute INTEGER,
+    x REAL,
+    y REAL,
+    end_x REAL,
+    end_y REAL,
+    team TEXT,
+    subtype TEXT,
+    xg REAL,
+    PRIMARY KEY (game, seq)
+) WITHOUT ROWID;
+"""
+
+EVENT_COLUMNS = ['type', 'player', 'minute', 'x', 'y', 'end_x', 'end_y', 'team', 'subtype', 'xg']
+
+BUSY_TIMEOUT_MS = 5000
+
+# Columns read back as numbers; everything else stays as Python objects until interned.
+COLUMN_DTYPES = {'minute': np.int64, 'x': np.float64, 'y': np.float64, 'end_x': np.float64, 'end_y': np.float64,
+                 'xg': np.float64}
+
+
+class EventLog:
+    # Append-only log of every game's events in one SQLite file. Each append is its own
+    # committed transaction, so an event is on disk as soon as append returns. Every session
+    # (and every process with the same file) shares it: appends take the game's next
+    # sequence number, and sessions read back the events after the last one they hold.
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=FULL')
+        # Other processes may hold the write lock for a moment; wait for it instead of failing.
+        self._conn.execute(f'PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}')
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def games(self):
+        with span('storage'), self._lock:
+            return [name for name, in self._conn.execute('SELECT name FROM games ORDER BY id')]
+
+    def add_game(self, game):
+        with span('storage'), self._lock:
+            self._conn.execute('INSERT OR IGNORE INTO games (name) VALUES (?)', (game,))
+
+    def remove_game(self, game):
+        with span('storage'), self._lock, self._conn:
+            self._conn.execute('BEGIN IMMEDIATE')
+            self._conn.execute('DELETE FROM events WHERE game = ?', (game,))
+            self._conn.execute('DELETE FROM games WHERE name = ?', (game,))
+
+    def append(self, game, event):
+        values = (
+            event['type'], event['player'], event['minute'], event['x'], event['y'],
+            event.get('end_x'), event.get('end_y'), event['team'], event.get(SUBTYPE_FIELDS[event['type']]),
+            event.get('xg'),
+        )
+        # The next sequence number comes from the primary key index, not from a scan.
+        with span('storage'), self._lock:
+            cursor = self._conn.execute(
+                f'INSERT INTO events (game, seq, {", ".join(EVENT_COLUMNS)}) '
+                'SELECT ?, COALESCE(MAX(seq), 0) + 1, ?, ?, ?, ?, ?, ?, ?, ?, ?, ? FROM events WHERE game = ? '
+                'RETURNING seq',
+                (game,) + values + (game,),
+            )
+            return cursor.fetchone()[0]
+
+    def append_many(self, game, columns):
+        # Appends a whole batch in one transaction; columns holds one array per EVENT_COLUMNS entry.
+        values = [
+            [None if isinstance(value, float) and np.isnan(value) else value for value in row]
+            for row in zip(*(columns[name].tolist() for name in EVENT_COLUMNS))
+        ]
+        # IMMEDIATE takes the write lock before reading the last sequence number, so another
+        # process can not take the same numbers in between.
+        with span('storage'), self._lock, self._conn:
+            self._conn.execute('BEGIN IMMEDIATE')
+            last, = self._conn.execute('SELECT COALESCE(MAX(seq), 0) FROM events WHERE game = ?', (game,)).fetchone()
+            self._conn.executemany(
+                f'INSERT INTO events (game, seq, {", ".join(EVENT_COLUMNS)}) VALUES (?, ?, {", ".join("?" * len(EVENT_COLUMNS))})',
+                ((game, last + index) + tuple(row) for index, row in enumerate(values, start=1)),
+            )
+            return last + len(values)
+
+    def events_since(self, game, seq=0):
+        # The game's events after sequence number seq as column arrays, or None when there are
+        # none, and the sequence number of the last one. A range scan of the primary key.
+        with span('storage'), self._lock:
+            rows = self._conn.execute(
+                f'SELECT seq, {", ".join(EVENT_COLUMNS)} FROM events WHERE game = ? AND seq > ? ORDER BY seq',
+                (game, seq),
+            ).fetchall()
+        if not rows:
+            return None, seq
+        seqs, *columns = zip(*rows)
+        return {
+            name: np.array(column, dtype=COLUMN_DTYPES.get(name, object)) for name, column in zip(EVENT_COLUMNS, columns)
+        }, seqs[-1]
+
+    def head(self, game):
+        # The game's id, None once it was removed, and the sequence number of its last event.
+        with span('storage'), self._lock:
+            return self._conn.execute(
+                'SELECT (SELECT id FROM games WHERE name = ?), (SELECT COALESCE(MAX(seq), 0) FROM events WHERE game = ?)',
+                (game, game),
+            ).fetchone()
+
+    def sync(self, game, store):
+        # Extends store with the events appended since it was last synced, by this session or any
+        # other, in sequence order. When the game was removed, and maybe added back, since then,
+        # its id changed or its events end before store.seq: the store is cleared and filled
+        # again from the first event. Returns how many events were pulled, plus the ones
+        # cleared when it started over.
+        game_id, last = self.head(game)
+        changed = 0
+        if game_id != store.game_id or last < store.seq:
+            changed = sum(len(table) for _, table in store.items())
+            store.clear()
+            store.game_id = game_id
+        if last == store.seq:
+            return changed
+        columns, store.seq = self.events_since(game, store.seq)
+        if columns is None:
+            return changed
+        store.extend(columns)
+        return changed + len(columns['type'])
+
+    def load(self, game):
+        store = EventStore()
+        self.sync(game, store)
+        return store
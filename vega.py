@@ -0,0 +1,169 @@
+import numpy as np
+
+from registry import EVENT_REGISTRY
+
+
+PITCH_LENGTH = 120
+PITCH_WIDTH = 80
+MARGIN = 3
+CHART_WIDTH = 720
+ARC_POINTS = 32
+MARKER_SHAPES = {'o': 'circle', '^': 'triangle-up'}
+# Half the angle of the part of a penalty arc outside the box: the box edge is 6 from the spot.
+PENALTY_ARC = np.degrees(np.arccos(6 / 10))
+
+
+def _arc(cx, cy, radius, start, end):
+    # Line segments approximating a circle arc between two angles in degrees.
+    angles = np.radians(np.linspace(start, end, ARC_POINTS + 1))
+    x = cx + radius * np.cos(angles)
+    y = cy + radius * np.sin(angles)
+    return [(x[i], y[i], x[i + 1], y[i + 1]) for i in range(len(x) - 1)]
+
+
+def _rectangle(x, y, x2, y2):
+    return [(x, y, x2, y), (x2, y, x2, y2), (x2, y2, x, y2), (x, y2, x, y)]
+
+
+def _pitch_segments():
+    # The markings of mplsoccer's statsbomb pitch, with box goals and corner arcs, as plain segments.
+    segments = _rectangle(0, 0, PITCH_LENGTH, PITCH_WIDTH)
+    segments.append((60, 0, 60, PITCH_WIDTH))
+    for left, side, facing in ((0, 1, 0), (PITCH_LENGTH, -1, 180)):
+        segments += _rectangle(left, 18, left + 18 * side, 62)
+        segments += _rectangle(left, 30, left + 6 * side, 50)
+        segments += _rectangle(left, 36, left - 2 * side, 44)
+        segments += _arc(left + 12 * side, 40, 10, facing - PENALTY_ARC, facing + PENALTY_ARC)
+    segments += _arc(60, 40, 10, 0, 360)
+    for cx, cy, start in ((0, 0, 0), (PITCH_LENGTH, 0, 90), (PITCH_LENGTH, PITCH_WIDTH, 180), (0, PITCH_WIDTH, 270)):
+        segments += _arc(cx, cy, 1, start, start + 90)
+    return [{'x': round(float(x), 2), 'y': round(float(y), 2), 'end_x': round(float(x2), 2), 'end_y': round(float(y2), 2)}
+            for x, y, x2, y2 in segments]
+
+
+PITCH_SEGMENTS = _pitch_segments()
+
+
+def _encodings(event_type, title, team_labels, subtype_labels):
+    spec = EVENT_REGISTRY[event_type]
+    colors = [(f'{team_labels[team]} - {subtype_labels[subtype]}', color)
+              for team, team_colors in spec['colors'].items() for subtype, color in team_colors.items()]
+    x = {'field': 'x', 'type': 'quantitative', 'axis': None,
+         'scale': {'domain': [-MARGIN, PITCH_LENGTH + MARGIN], 'nice': False, 'zero': False}}
+    y = {'field': 'y', 'type': 'quantitative', 'axis': None,
+         'scale': {'domain': [-MARGIN, PITCH_WIDTH + MARGIN], 'nice': False, 'zero': False, 'reverse': True}}
+    color = {'field': 'label', 'type': 'nominal', 'title': title,
+             'scale': {'domain': [label for label, _ in colors], 'range': [color for _, color in colors]}}
+    tooltip = [{'field': 'player', 'type': 'nominal'}, {'field': 'minute', 'type': 'quantitative'},
+               {'field': 'team', 'type': 'nominal'}, {'field': 'subtype', 'type': 'nominal'}]
+    if 'xg' in spec['fields']:
+        tooltip.append({'field': 'xg', 'type': 'quantitative', 'format': '.2f'})
+    return x, y, color, tooltip
+
+
+def _layers(event_type, x, y, color, tooltip):
+    # The pitch markings, then the events drawn from the chart's data like draw_events draws them.
+    method, _, style = EVENT_REGISTRY[event_type]['style']
+    layers = [{
+        'data': {'values': PITCH_SEGMENTS},
+        'mark': {'type': 'rule', 'color': 'black', 'strokeWidth': 1},
+        'encoding': {'x': x, 'y': y, 'x2': {'field': 'end_x'}, 'y2': {'field': 'end_y'}},
+    }]
+    if method == 'arrows':
+        layers.append({
+            'mark': {'type': 'rule', 'strokeWidth': style['width']},
+            'encoding': {'x': x, 'y': y, 'x2': {'field': 'end_x'}, 'y2': {'field': 'end_y'}, 'color': color,
+                         'tooltip': tooltip},
+        })
+        layers.append({
+            'mark': {'type': 'point', 'shape': 'triangle-up', 'filled': True, 'size': 60, 'opacity': 1},
+            'encoding': {'x': dict(x, field='end_x'), 'y': dict(y, field='end_y'),
+                         'angle': {'field': 'angle', 'type': 'quantitative', 'scale': None},
+                         'color': color, 'tooltip': tooltip},
+        })
+    else:
+        layers.append({
+            'mark': {'type': 'point', 'shape': MARKER_SHAPES[style.get('marker', 'o')], 'filled': True,
+                     'size': style['s'], 'opacity': 1},
+            'encoding': {'x': x, 'y': y, 'color': color, 'tooltip': tooltip},
+        })
+    return layers
+
+
+def _chart(layers):
+    return {
+        'width': CHART_WIDTH,
+        'height': round(CHART_WIDTH * (PITCH_WIDTH + 2 * MARGIN) / (PITCH_LENGTH + 2 * MARGIN)),
+        'layer': layers,
+        'config': {'view': {'stroke': None}},
+    }
+
+
+def pitch_spec(event_type, title, team_labels, subtype_labels):
+    # The Vega-Lite spec of one event type's pitch without its data, which the chart gets
+    # as a table; built once per language. Pan and zoom are bound to the scales, so they
+    # happen in the browser without a rerun.
+    x, y, color, tooltip = _encodings(event_type, title, team_labels, subtype_labels)
+    layers = _layers(event_type, x, y, color, tooltip)
+    layers[1]['params'] = [{'name': 'zoom', 'select': 'interval', 'bind': 'scales'}]
+    return _chart(layers)
+
+
+def entry_spec(event_type, title, team_labels, subtype_labels):
+    # The pitch events are placed on: the events waiting to be saved as its data, and on top an
+    # invisible grid of whole-unit points. Its 'click' selection picks the grid point nearest
+    # to the click, which Streamlit returns as {'x': ..., 'y': ...}.
+    x, y, color, tooltip = _encodings(event_type, title, team_labels, subtype_labels)
+    layers = _layers(event_type, x, y, color, tooltip)
+    layers.append({
+        'data': {'sequence': {'start': 0, 'stop': (PITCH_LENGTH + 1) * (PITCH_WIDTH + 1), 'as': 'cell'}},
+        'transform': [{'calculate': f'datum.cell % {PITCH_LENGTH + 1}', 'as': 'x'},
+                      {'calculate': f'floor(datum.cell / {PITCH_LENGTH + 1})', 'as': 'y'}],
+        'mark': {'type': 'point', 'opacity': 0},
+        'encoding': {'x': x, 'y': y},
+        'params': [{'name': 'click', 'select': {'type': 'point', 'fields': ['x', 'y'], 'nearest': True,
+                                                'on': 'click', 'clear': False}}],
+    })
+    return _chart(layers)
+
+
+def with_start(spec, start):
+    # The entry spec with the first click of an arrow marked, until its end is clicked.
+    if start is None:
+        return spec
+    x, y = start
+    marker = {
+        'data': {'values': [{'x': x, 'y': y}]},
+        'mark': {'type': 'point', 'shape': 'circle', 'filled': True, 'size': 80, 'color': 'black'},
+        'encoding': {'x': spec['layer'][0]['encoding']['x'], 'y': spec['layer'][0]['encoding']['y']},
+    }
+    return dict(spec, layer=spec['layer'][:-1] + [marker, spec['layer'][-1]])
+
+
+def events_frame(events, team_labels, subtype_labels):
+    # The rows the chart needs, with the labels as categoricals so the table stays small.
+    import pandas as pd
+
+    def labels(interner, translations):
+        return [translations.get(value, str(value)) for value in interner.values]
+
+    teams = labels(events.teams, team_labels)
+    subtypes = labels(events.subtypes, subtype_labels)
+    combined = events.team.astype(np.int64) * max(len(subtypes), 1) + events.subtype
+    frame = pd.DataFrame({
+        'x': events.x.astype(np.float32),
+        'y': events.y.astype(np.float32),
+        'player': pd.Categorical.from_codes(events.player, categories=events.players.values),
+        'minute': events.minute,
+        'team': pd.Categorical.from_codes(events.team, categories=teams),
+        'subtype': pd.Categorical.from_codes(events.subtype, categories=subtypes),
+        'label': pd.Categorical.from_codes(combined, categories=[f'{team} - {subtype}' for team in teams for subtype in subtypes]),
+    })
+    if EVENT_REGISTRY[events.event_type]['style'][0] == 'arrows':
+        frame['end_x'] = events.end_x.astype(np.float32)
+        frame['end_y'] = events.end_y.astype(np.float32)
+        # Clockwise degrees from straight up on screen, where y grows downwards like the pitch's.
+        frame['angle'] = np.degrees(np.arctan2(events.end_x - events.x, -(events.end_y - events.y))).astype(np.float32)
+    if 'xg' in EVENT_REGISTRY[events.event_type]['fields']:
+        frame['xg'] = events.xg.astype(np.float32)
+    return frame